@@ -1,12 +1,37 @@
+import time
+started = time.perf_counter()  # For the WINGUILITE_STARTUP_PROBE timing
+import sys
+
+if len(sys.argv) > 1 and sys.argv[1].startswith("-"):
+    # Options mean a headless run (guilite/cli.py) and tkinter is never loaded; a bare
+    # path is a file opened from Explorer (the installer's "%1" open command)
+    from guilite.cli import main
+    sys.exit(main())
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkinter import font
-import subprocess
 import threading
-import re
 import os
-import sys
-import json
+
+from guilite import settings
+from guilite.backend import get_backend
+from guilite.cache import DetailCache
+from guilite.catalog import get_catalog
+from guilite.checklist import CheckList
+from guilite.index import PackageIndex
+from guilite.install import ALREADY_INSTALLED, INSTALLED, install_packages, upgrade_packages
+from guilite.installed import InstalledIndex, diff_rows
+from guilite.logstream import LogPump
+from guilite.parse import TableParser
+from guilite.pipeline import describe as describe_pipeline
+from guilite.poller import UpdatePoller
+from guilite.prefetch import DetailPrefetcher
+from guilite.record import PackageRecord, RecordStore, installer_types, parse_show
+from guilite.scheduler import (BACKGROUND, READ, USER, WRITE, TransientError, describe as describe_activity,
+                               get_scheduler, is_transient)
+from guilite.trace import StallMonitor, get_tracer
+from guilite.ui_queue import Batcher, UiQueue
 
 # --- Multiple Installer Utility (from Multiple_installer.py) ---
 def clear_spaces(name):
@@ -37,26 +62,27 @@ class InstallerApp(tk.Toplevel):
         style.configure("TMenubutton", background="#eaf0fb", font=self.label_font)
 
         self.categories = {
-            "media": {"label": "Media & Video", "data": {}, "vars": {}},
-            "browsers": {"label": "Web Browsers", "data": {}, "vars": {}},
-            "utilities": {"label": "System Utilities", "data": {}, "vars": {}},
-            "documentation": {"label": "Office + PDF", "data": {}, "vars": {}},
-            "developing": {"label": "Development Tools", "data": {}, "vars": {}},
+            "media": {"label": "Media & Video", "data": {}, "list": None},
+            "browsers": {"label": "Web Browsers", "data": {}, "list": None},
+            "utilities": {"label": "System Utilities", "data": {}, "list": None},
+            "documentation": {"label": "Office + PDF", "data": {}, "list": None},
+            "developing": {"label": "Development Tools", "data": {}, "list": None},
         }
-        self.load_packages()
+        if not self.load_packages():
+            return
         self.create_widgets()
+        follow_installed(self, self.show_installed)
 
     def load_packages(self):
-        base_path = os.path.dirname(os.path.abspath(sys.argv[0]))
+        # One precompiled catalog instead of a JSON file per category
+        catalog = get_catalog(PACKAGES_DIR, settings.CATALOG_PATH)
         for cat, info in self.categories.items():
-            json_filename = f"{cat if cat != 'document' else 'documentation'}.json"
-            json_path = os.path.join(base_path, "packages", json_filename)
-            try:
-                with open(json_path, "r", encoding="utf-8") as f:
-                    info["data"] = json.load(f)
-            except FileNotFoundError:
-                messagebox.showerror("Error", f"File {json_filename} not found in 'packages' folder.")
+            if cat not in catalog:
+                messagebox.showerror("Error", f"File {cat}.json not found in 'packages' folder.")
                 self.destroy()
+                return False
+            info["data"] = catalog[cat]
+        return True
 
     def create_widgets(self):
         header = tk.Frame(self, bg="#4078c0", height=48)
@@ -71,7 +97,16 @@ class InstallerApp(tk.Toplevel):
         header_lbl.pack(side='left', padx=18, pady=8)
 
         self.selected_label = ttk.Label(self, text="🛒 You have selected 0 for installation.", font=self.label_font)
-        self.selected_label.pack(pady=(18, 10))
+        self.selected_label.pack(pady=(18, 6))
+        self.stage_label = ttk.Label(self, text="", font=("Segoe UI", 9), foreground="#57606f")
+        self.stage_label.pack()
+
+        filter_frame = tk.Frame(self, bg="#f5f6fa")
+        filter_frame.pack(fill='x', padx=18)
+        ttk.Label(filter_frame, text="Filter:").pack(side='left')
+        self.filter_entry = ttk.Entry(filter_frame, font=self.label_font)
+        self.filter_entry.pack(side='left', fill='x', expand=True, padx=(8, 0))
+        self.filter_entry.bind('<KeyRelease>', self.apply_filter)
 
         menubar = tk.Menu(self)
         basket_menu = tk.Menu(menubar, tearoff=0)
@@ -80,18 +115,16 @@ class InstallerApp(tk.Toplevel):
         menubar.add_cascade(label="🛒 Basket", menu=basket_menu)
         self.config(menu=menubar)
 
+        # Tabs start empty; each list is built the first time its tab is shown
         self.notebook = ttk.Notebook(self)
         self.frames = {}
         for cat, info in self.categories.items():
             frame = ttk.Frame(self.notebook)
             self.frames[cat] = frame
             self.notebook.add(frame, text=info["label"])
-            for name in info["data"]:
-                var = tk.BooleanVar()
-                cb = ttk.Checkbutton(frame, text=name, variable=var, command=self.update_selected, style="TCheckbutton")
-                cb.pack(anchor="w", padx=18, pady=4)
-                info["vars"][name] = var
         self.notebook.pack(expand=True, fill="both", padx=18, pady=10)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.build_tab(next(iter(self.categories)))
 
         btns_frame = tk.Frame(self, bg="#f5f6fa")
         btns_frame.pack(pady=(0, 12))
@@ -100,29 +133,63 @@ class InstallerApp(tk.Toplevel):
         self.install_btn = ttk.Button(btns_frame, text="🚀 Install Selected", command=self.start_install_thread)
         self.install_btn.pack(side='left', padx=8)
 
-    def update_selected(self):
-        total = 0
+        self.activity_label = ttk.Label(self, text="", font=("Segoe UI", 9), foreground="#57606f")
+        self.activity_label.pack(fill='x', padx=18, pady=(0, 6))
+        follow_scheduler(self.activity_label)
+
+    def on_tab_changed(self, event=None):
+        self.build_tab(list(self.categories)[self.notebook.index("current")])
+
+    def build_tab(self, cat):
+        info = self.categories[cat]
+        if info["list"] is not None:
+            return
+        checklist = CheckList(self.frames[cat], ("Name", "ID", "Installed"), widths=(250, 250, 120), on_change=self.update_selected)
+        checklist.set_rows(self.catalog_rows(info["data"]))
+        checklist.filter(self.filter_entry.get())
+        checklist.pack(expand=True, fill="both")
+        info["list"] = checklist
+
+    def catalog_rows(self, data):
+        return ((name, (name, pkg_id, installed_index.status(pkg_id))) for name, pkg_id in data.items())
+
+    def show_installed(self, pkg_ids):
+        # Installed-state changed: rebuild after a full snapshot, touch only the changed rows otherwise
+        wanted = None if pkg_ids is None else {pkg_id.casefold() for pkg_id in pkg_ids}
         for info in self.categories.values():
-            total += sum(var.get() for var in info["vars"].values())
+            if info["list"] is None:
+                continue
+            if wanted is None:
+                info["list"].set_rows(self.catalog_rows(info["data"]))
+                continue
+            for name, pkg_id in info["data"].items():
+                if pkg_id.casefold() in wanted:
+                    info["list"].upsert(name, (name, pkg_id, installed_index.status(pkg_id)))
+
+    def update_selected(self, count=None):
+        total = sum(info["list"].count for info in self.categories.values() if info["list"] is not None)
         self.selected_label.config(text=f"🛒 You have selected {total} for installation.")
 
+    def apply_filter(self, event=None):
+        text = self.filter_entry.get()
+        for info in self.categories.values():
+            if info["list"] is not None:
+                info["list"].filter(text)
+
+    def selected_items(self):
+        # [(cat, name)] for every ticked application, in list order
+        return [(cat, name) for cat, info in self.categories.items() if info["list"] is not None
+                for name in info["list"].checked_keys()]
+
     def show_selected(self):
-        selected = []
-        for cat, info in self.categories.items():
-            for name, var in info["vars"].items():
-                if var.get():
-                    selected.append(f"{info['label']}: {name}")
+        selected = [f"{self.categories[cat]['label']}: {name}" for cat, name in self.selected_items()]
         if selected:
             messagebox.showinfo("Selected Applications", "\n".join(selected))
         else:
             messagebox.showinfo("Selected Applications", "No applications selected.")
 
     def show_basket_window(self):
-        selected = []
-        for cat, info in self.categories.items():
-            for name, var in info["vars"].items():
-                if var.get():
-                    selected.append((info['label'], name, cat))
+        selected = [(self.categories[cat]['label'], name, cat) for cat, name in self.selected_items()]
         win = tk.Toplevel(self)
         win.title("🛒 Basket - Selected Applications")
         win.geometry("400x400")
@@ -141,22 +208,53 @@ class InstallerApp(tk.Toplevel):
             lbl2.pack(pady=10)
 
     def start_install_thread(self):
-        threading.Thread(target=self.install_selected, daemon=True).start()
-
-    def install_selected(self):
-        selected = []
-        for cat, info in self.categories.items():
-            for name, var in info["vars"].items():
-                if var.get():
-                    selected.append((cat, name))
+        selected = self.selected_items()
         if not selected:
             messagebox.showinfo("Installation", "No applications selected.")
             return
+        # Already installed and up to date: nothing for winget to do
+        present = []
+        for cat, name in selected:
+            row = installed_index.get(self.categories[cat]["data"][name])
+            if row is not None and not row.available:
+                present.append((cat, name))
+        if present:
+            selected = [item for item in selected if item not in present]
+            names = ", ".join(name for _, name in present)
+            if not selected:
+                messagebox.showinfo("Installation", f"Already installed: {names}")
+                return
+            self.show_status(f"Skipping already installed: {names}")
+        scheduler.submit(
+            lambda cancel: self.install_selected(selected, cancel),
+            key=("install", tuple(selected)),
+            lane=WRITE,
+            label=f"Installing {len(selected)} applications",
+            retries=0,
+            on_done=lambda job: job.error is not None and ui_queue.post(self.show_status, f"Installation failed: {job.error}")
+        )
+
+    def install_selected(self, selected, cancel=None):
+        # Scheduler thread: by default the whole selection goes to one `winget import`
+        names = {}
         for cat, name in selected:
-            order = self.categories[cat]["data"][name]
-            self.show_status(f"Installing {name}...")
-            subprocess.run(f"winget install -e --id {order} --accept-source-agreements --accept-package-agreements --silent", shell=True)
-        self.show_status("Installation completed!")
+            names[self.categories[cat]["data"][name]] = name
+
+        def on_status(pkg_id, state):
+            ui_queue.post(self.show_status, f"{names.get(pkg_id, pkg_id)}: {state}...")
+
+        def on_progress(snapshot):
+            ui_queue.post(self.stage_label.config, {"text": describe_pipeline(snapshot)})
+
+        results, seconds = install_packages(get_backend(), list(names), settings.INSTALL_MODE, on_status,
+                                            cancel=cancel, on_progress=on_progress,
+                                            installer_type=installer_types(details_cache, package_records))
+        failed = [names[pkg_id] for pkg_id in names if results.get(pkg_id, {}).get("state") not in (INSTALLED, ALREADY_INSTALLED)]
+        installed_changed(names)
+        msg = f"Installation completed in {seconds:.0f}s ({settings.INSTALL_MODE} mode)!"
+        if failed:
+            msg += f" Failed: {', '.join(failed)}"
+        ui_queue.post(self.show_status, msg)
 
     def show_status(self, msg):
         self.selected_label.config(text=msg)
@@ -171,11 +269,16 @@ class UpdateManagerApp(tk.Toplevel):
         self.resizable(False, False)
         self.configure(bg="#f5f6fa")
 
-        self.updates = {}  # {name: id}
-        self.vars = {}     # {name: BooleanVar}
+        self.updates = {}  # {id: PackageRow}
 
         self.create_widgets()
-        threading.Thread(target=self.fetch_updates, daemon=True).start()
+        follow_installed(self, self.show_installed)
+        # The installed-state snapshot already knows the upgrades: show them now, re-read if old
+        if installed_index.taken:
+            self.show_updates(installed_index.upgrades())
+        age = installed_index.age()
+        if age is None or age > settings.INSTALLED_MAX_AGE:
+            self.fetch_updates()
 
     def create_widgets(self):
         header = tk.Frame(self, bg="#4078c0", height=48)
@@ -189,12 +292,19 @@ class UpdateManagerApp(tk.Toplevel):
         ).pack(side='left', padx=18, pady=8)
 
         self.status_label = ttk.Label(self, text="Searching for available updates...", font=("Segoe UI", 11))
-        self.status_label.pack(pady=(18, 10))
+        self.status_label.pack(pady=(18, 6))
+        self.stage_label = ttk.Label(self, text="", font=("Segoe UI", 9), foreground="#57606f")
+        self.stage_label.pack()
 
-        self.list_frame = tk.Frame(self, bg="#f5f6fa")
-        self.list_frame.pack(expand=True, fill="both", padx=18, pady=10)
+        filter_frame = tk.Frame(self, bg="#f5f6fa")
+        filter_frame.pack(fill='x', padx=18)
+        ttk.Label(filter_frame, text="Filter:", font=("Segoe UI", 11)).pack(side='left')
+        self.filter_entry = ttk.Entry(filter_frame, font=("Segoe UI", 11))
+        self.filter_entry.pack(side='left', fill='x', expand=True, padx=(8, 0))
+        self.filter_entry.bind('<KeyRelease>', lambda event: self.checklist.filter(self.filter_entry.get()))
 
-        self.checkbuttons = []
+        self.checklist = CheckList(self, ("Name", "ID", "Version", "Available"), widths=(190, 170, 90, 90), on_change=self.update_count)
+        self.checklist.pack(expand=True, fill="both", padx=18, pady=10)
 
         btns_frame = tk.Frame(self, bg="#f5f6fa")
         btns_frame.pack(pady=12)
@@ -202,253 +312,660 @@ class UpdateManagerApp(tk.Toplevel):
         self.update_btn.pack(side='left', padx=8)
         self.update_all_btn = ttk.Button(btns_frame, text="Update All", command=self.update_all)
         self.update_all_btn.pack(side='left', padx=8)
+        self.refresh_btn = ttk.Button(btns_frame, text="Refresh", command=self.fetch_updates)
+        self.refresh_btn.pack(side='left', padx=8)
+
+        self.activity_label = ttk.Label(self, text="", font=("Segoe UI", 9), foreground="#57606f")
+        self.activity_label.pack(fill='x', padx=18, pady=(0, 6))
+        follow_scheduler(self.activity_label)
 
     def fetch_updates(self):
-        self.status_label.config(text="Searching for available updates...")
-        try:
-            result = subprocess.run(
-                ["winget", "upgrade"],
-                capture_output=True,
-                text=True,
-                encoding="utf-8"
-            )
-            lines = result.stdout.splitlines()
-            start = 0
-            for i, line in enumerate(lines):
-                if line.strip().startswith("Name"):
-                    start = i + 1
-                    break
-            for line in lines[start:]:
-                cols = [c for c in line.strip().split("  ") if c]
-                if len(cols) >= 3:
-                    name = cols[0].strip()
-                    pkg_id = cols[1].strip()
-                    self.updates[name] = pkg_id
-            self.show_updates()
-        except Exception as e:
-            self.status_label.config(text=f"Error fetching updates: {e}")
-
-    def show_updates(self):
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-        self.vars.clear()
-        self.checkbuttons.clear()
+        # A new `winget list` snapshot; show_installed() picks up the result
+        if not self.updates:
+            self.status_label.config(text="Searching for available updates...")
+        refresh_installed(USER, self.updates_fetched)
+
+    def updates_fetched(self, job):
+        if job.error is not None:
+            ui_queue.post(self.show_status, f"Error fetching updates: {job.error}")
+        elif job.result is False:
+            ui_queue.post(self.show_status, "Could not read the installed applications from winget.")
+
+    def show_installed(self, pkg_ids):
+        self.show_updates(installed_index.upgrades())
+
+    def show_updates(self, rows):
+        # Only rows that appeared, went away or changed version touch the widget
+        updates = {row.id: row for row in rows}
+        if not self.updates:
+            self.checklist.set_rows((row.id, (row.name, row.id, row.version, row.available)) for row in rows)
+        else:
+            added, removed, changed = diff_rows(self.updates, updates)
+            for pkg_id in removed:
+                self.checklist.remove(pkg_id)
+            for pkg_id in added + changed:
+                row = updates[pkg_id]
+                self.checklist.upsert(pkg_id, (row.name, row.id, row.version, row.available))
+        self.updates = updates
         if not self.updates:
             self.status_label.config(text="No updates available.")
             return
-        self.status_label.config(text=f"Found {len(self.updates)} updates available.")
-        for name, pkg_id in self.updates.items():
-            var = tk.BooleanVar()
-            cb = ttk.Checkbutton(self.list_frame, text=f"{name} ({pkg_id})", variable=var)
-            cb.pack(anchor="w", padx=8, pady=4)
-            self.vars[name] = var
-            self.checkbuttons.append(cb)
+        self.update_count(self.checklist.count)
+
+    def show_status(self, msg):
+        self.status_label.config(text=msg)
+
+    def update_count(self, count):
+        self.status_label.config(text=f"Found {len(self.updates)} updates available, {count} selected.")
 
     def update_selected(self):
-        selected = [self.updates[name] for name, var in self.vars.items() if var.get()]
+        selected = self.checklist.checked_keys()
         if not selected:
             messagebox.showinfo("Update", "No applications selected for update.")
             return
         self.status_label.config(text="Updating selected applications...")
-        threading.Thread(target=self.run_updates, args=(selected,), daemon=True).start()
+        self.submit_updates(selected)
 
     def update_all(self):
-        all_ids = list(self.updates.values())
+        all_ids = list(self.updates)
         if not all_ids:
             messagebox.showinfo("Update", "No applications available for update.")
             return
         self.status_label.config(text="Updating all applications...")
-        threading.Thread(target=self.run_updates, args=(all_ids,), daemon=True).start()
-
-    def run_updates(self, pkg_ids):
-        for pkg_id in pkg_ids:
-            self.status_label.config(text=f"Updating {pkg_id}...")
-            subprocess.run(
-                f'winget upgrade --id {pkg_id} --accept-source-agreements --accept-package-agreements --silent',
-                shell=True
-            )
-        self.status_label.config(text="Update process completed!")
-        messagebox.showinfo("Update", "Selected applications have been updated.")
+        self.submit_updates(all_ids)
+
+    def submit_updates(self, pkg_ids):
+        scheduler.submit(
+            lambda cancel: self.run_updates(pkg_ids, cancel),
+            key=("upgrade", tuple(pkg_ids)),
+            lane=WRITE,
+            label=f"Updating {len(pkg_ids)} applications",
+            retries=0,
+            on_done=lambda job: job.error is not None and ui_queue.post(self.show_status, f"Update failed: {job.error}")
+        )
 
-# --- Main WinGUILite GUI (original code, with launchers updated) ---
-import tkinter as tk
-from tkinter import ttk, messagebox
-from tkinter import font
-import subprocess
-import threading
-import re
-import os
-import sys
-import json
+    def run_updates(self, pkg_ids, cancel=None):
+        # Scheduler thread: in pipeline mode the next installers download while one upgrades
+        def on_status(pkg_id, state):
+            ui_queue.post(self.show_status, f"{pkg_id}: {state}...")
+
+        def on_progress(snapshot):
+            ui_queue.post(self.stage_label.config, {"text": describe_pipeline(snapshot)})
+
+        results, _ = upgrade_packages(get_backend(), pkg_ids, settings.UPDATE_MODE, on_status,
+                                      cancel=cancel, on_progress=on_progress,
+                                      installer_type=installer_types(details_cache, package_records))
+        failed = [pkg_id for pkg_id in pkg_ids if results.get(pkg_id, {}).get("state") != INSTALLED]
+        installed_changed(pkg_ids)
+        ui_queue.post(self.updates_done, failed)
+
+    def updates_done(self, failed):
+        if failed:
+            self.status_label.config(text=f"Update process completed, {len(failed)} failed.")
+            messagebox.showwarning("Update", "These applications could not be updated:\n" + "\n".join(failed))
+        else:
+            self.status_label.config(text="Update process completed!")
+            messagebox.showinfo("Update", "Selected applications have been updated.")
+
+# --- Diagnostics: where the time goes ---
+class DiagnosticsApp(tk.Toplevel):
+    # Percentiles of the timings in guilite.trace, per winget command, scheduler lane and UI stalls
+    COLUMNS = ("Operation", "Count", "Failed", "Queue wait", "Start", "First output", "Duration", "Output")
+    WIDTHS = (150, 60, 60, 90, 70, 100, 90, 80)
+
+    def __init__(self, master=None):
+        super().__init__(master)
+        self.title("WinGUILite - Diagnostics")
+        self.geometry("760x460")
+        self.configure(bg="#f5f6fa")
+        self.tracer = get_tracer()
+        self.create_widgets()
+        self.refresh()
+
+    def create_widgets(self):
+        header = tk.Frame(self, bg="#4078c0", height=48)
+        header.pack(fill='x')
+        tk.Label(
+            header,
+            text="Diagnostics - Timings in milliseconds",
+            font=("Segoe UI", 16, "bold"),
+            bg="#4078c0",
+            fg="white"
+        ).pack(side='left', padx=18, pady=8)
 
+        options = tk.Frame(self, bg="#f5f6fa")
+        options.pack(fill='x', padx=18, pady=(12, 0))
+        ttk.Label(options, text="Percentile:", font=("Segoe UI", 11)).pack(side='left')
+        self.percentile = tk.IntVar(value=50)
+        for p in (50, 90, 99):
+            ttk.Radiobutton(options, text=f"p{p}", value=p, variable=self.percentile, command=self.refresh).pack(side='left', padx=6)
+        self.status_label = ttk.Label(options, text="", font=("Segoe UI", 9), foreground="#57606f")
+        self.status_label.pack(side='right')
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='headings', height=10)
+        for c, width in zip(self.COLUMNS, self.WIDTHS):
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=width, anchor='w' if c == "Operation" else 'e')
+        self.tree.pack(expand=True, fill='both', padx=18, pady=10)
+
+        btns_frame = tk.Frame(self, bg="#f5f6fa")
+        btns_frame.pack(pady=(0, 12))
+        ttk.Button(btns_frame, text="Export JSON lines", command=lambda: self.export("jsonl")).pack(side='left', padx=8)
+        ttk.Button(btns_frame, text="Export Chrome trace", command=lambda: self.export("trace.json")).pack(side='left', padx=8)
+        ttk.Button(btns_frame, text="Clear", command=self.clear).pack(side='left', padx=8)
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        p = self.percentile.get()
+        summary = self.tracer.summary()
+
+        def ms(stats, field):
+            value = stats[field][p] if field in stats else None
+            return "" if value is None else f"{value:.0f}"
+
+        rows = []
+        for kind, stats in summary["processes"].items():
+            rows.append((kind or "?", stats["count"], stats["failed"], ms(stats, "queue_wait_ms"), ms(stats, "start_latency_ms"),
+                         ms(stats, "ttfb_ms"), ms(stats, "duration_ms"), f"{stats['bytes'] / 1024:.0f} KB"))
+        for lane, stats in summary["jobs"].items():
+            rows.append((f"{lane} jobs", stats["count"], "", ms(stats, "queue_wait_ms"), "", "", ms(stats, "duration_ms"), ""))
+        stalls = summary["stalls"]
+        rows.append(("UI stalls", stalls["count"], "", "", "", "", ms(stalls, "duration_ms"), ""))
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert('', 'end', values=row)
+        if not self.tracer.enabled:
+            self.status_label.config(text="Tracing is off (WINGUILITE_TRACE=0)")
+        self.after(1000, self.refresh)
+
+    def export(self, suffix):
+        path = os.path.join(settings.TRACE_DIR, f"winguilite-{time.strftime('%Y%m%d-%H%M%S')}.{suffix}")
+        try:
+            if suffix == "jsonl":
+                self.tracer.export_jsonl(path)
+            else:
+                self.tracer.export_chrome(path)
+        except OSError as e:
+            messagebox.showerror("Diagnostics", f"Could not write {path}: {e}", parent=self)
+            return
+        self.status_label.config(text=f"Saved {path}")
+
+    def clear(self):
+        self.tracer.clear()
+        self.status_label.config(text="")
+
+# --- Main WinGUILite GUI (original code, with launchers updated) ---
 # List to store all package IDs
 all_ids = []
-package_details = {}  # Store raw details per package ID
-
-def run_command(command):
+package_records = RecordStore(settings.RECORD_MAX_ENTRIES)  # Parsed `winget show` per package ID
+waiting_detail = None  # (name, ID) of the clicked package whose details are still loading
+search_job = None  # The running winget search; cancelled when a new one starts
+search_gen = 0
+search_running = False
+search_after_id = None  # Pending debounced winget search
+last_typed_query = ""
+shown_ids = set()  # IDs currently in the results tree
+package_index = PackageIndex(max_saved=settings.INDEX_MAX_SAVED)
+installed_index = InstalledIndex()
+PACKAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "packages")
+# Main window frames, built on first use by build_search_ui()/build_detail_ui()
+search_frame = option_frame = entry_search = tree_results = label_search_status = None
+detail_frame = label_pkg_name = install_btn = uninstall_btn = txt_info = None
+details_cache = DetailCache(
+    settings.CACHE_PATH,
+    ttl=settings.CACHE_TTL,
+    stale=settings.CACHE_STALE,
+    max_entries=settings.CACHE_MAX_ENTRIES
+)
+
+def run_command(operation, cancel=None):
+    # operation(cancel=...) wraps one backend call; returns (returncode, output), returncode None on errors
     try:
-        result = subprocess.run(
-            ["powershell", "-Command", command],
-            capture_output=True,
-            text=True,
-            encoding="utf-8"
-        )
-        return result.stdout.strip()
+        code, output = operation(cancel=cancel)
+        return code, output.strip()
     except Exception as e:
-        return f"Error executing command: {e}"
+        return None, f"Error executing command: {e}"
+
+def run_command_live(operation, output_widget, install_btn, uninstall_btn, log_name=None, label="", on_finish=None):
+    install_btn.config(state='disabled')
+    uninstall_btn.config(state='disabled')
+    log_path = None
+    if settings.SAVE_LOGS and log_name:
+        os.makedirs(settings.LOG_DIR, exist_ok=True)
+        log_path = os.path.join(settings.LOG_DIR, f"{log_name}-{time.strftime('%Y%m%d-%H%M%S')}.log")
+    pump = LogPump(output_widget, max_lines=settings.LOG_MAX_LINES, fps=settings.LOG_FPS, log_path=log_path)
+    pump.start()
+
+    def restore_buttons():
+        install_btn.config(state='normal')
+        uninstall_btn.config(state='normal')
+
+    def done(job):
+        # Only the pump touches the widget; the scheduler thread just feeds it lines
+        if job.error is not None:
+            pump.finish(f"Error: {job.error}", restore_buttons)
+        else:
+            pump.finish("\nDone.\n", restore_buttons)
+        if on_finish is not None:
+            on_finish()
+
+    # Mutating work waits its turn behind installs started from any other window
+    scheduler.submit(
+        lambda cancel: operation(on_line=pump.write, cancel=cancel),
+        key=log_name,
+        lane=WRITE,
+        label=label,
+        on_done=done
+    )
 
-def run_command_live(command, output_widget, install_btn, uninstall_btn):
-    def task():
-        try:
-            install_btn.config(state='disabled')
-            uninstall_btn.config(state='disabled')
-            process = subprocess.Popen(
-                ["powershell", "-NoProfile", "-Command", f'chcp 65001 >$null; {command}'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            output_widget.config(state='normal')
-            output_widget.delete('1.0', tk.END)
-
-            while True:
-                chunk = process.stdout.readline()
-                if not chunk:
-                    break
-
-                if '\r' in chunk:
-                    cleaned = chunk.strip().replace('\r', '')
-                    output_widget.delete("end-2l", "end-1l")
-                    output_widget.insert(tk.END, cleaned + '\n')
-                elif 'KB' in chunk or 'MB' in chunk:
-                    progress = re.sub(r'\r', '', chunk).strip()
-                    output_widget.delete("end-2l", "end-1l")
-                    output_widget.insert(tk.END, progress + '\n')
-                elif chunk.strip() in {'-', '\\', '|', '/'}:
-                    output_widget.delete("end-2l", "end-1l")
-                    output_widget.insert(tk.END, chunk.strip() + '\n')
-                else:
-                    output_widget.insert(tk.END, chunk)
-
-                output_widget.see(tk.END)
-                output_widget.update_idletasks()
-
-            output_widget.insert(tk.END, "\nDone.\n")
-        except Exception as e:
-            output_widget.insert(tk.END, f"Error: {e}")
-        finally:
-            output_widget.config(state='disabled')
-            install_btn.config(state='normal')
-            uninstall_btn.config(state='normal')
-
-    threading.Thread(target=task, daemon=True).start()
+def follow_scheduler(label):
+    # Keep label showing what the shared scheduler is doing, until label is destroyed
+    latest = []
+    lock = threading.Lock()
+
+    def show():
+        with lock:
+            snapshot = latest.pop()
+        if label.winfo_exists():
+            label.config(text=describe_activity(snapshot))
+
+    def on_change(snapshot):
+        # Called from any thread; at most one update is waiting in the UI queue
+        with lock:
+            if latest:
+                latest[0] = snapshot
+                return
+            latest.append(snapshot)
+        ui_queue.post(show)
+
+    scheduler.subscribe(on_change)
+    label.bind('<Destroy>', lambda event: scheduler.unsubscribe(on_change), add='+')
+
+def follow_installed(window, callback):
+    # callback(pkg_ids) runs on the Tk thread whenever installed_index changes, until window is destroyed
+    def listener(pkg_ids):
+        ui_queue.post(callback, pkg_ids)
+
+    def on_destroy(event):
+        if event.widget is window and listener in installed_index.listeners:
+            installed_index.listeners.remove(listener)
+
+    installed_index.listeners.append(listener)
+    window.bind('<Destroy>', on_destroy, add='+')
+
+def refresh_installed(priority=BACKGROUND, on_done=None):
+    # Full `winget list` snapshot; asking again while one is queued or running shares it
+    def task(cancel):
+        if not installed_index.refresh(get_backend(), cancel):
+            return False
+        installed_index.save(settings.INSTALLED_PATH)
+        return True
+
+    return scheduler.submit(task, key=("list",), lane=READ, priority=priority,
+                            label="Reading installed applications", on_done=on_done)
+
+def installed_changed(pkg_ids):
+    # After we install, upgrade or uninstall: re-read only those packages, or everything for big batches
+    pkg_ids = list(pkg_ids)
+    if len(pkg_ids) > 5:
+        return refresh_installed()
+
+    def task(cancel):
+        installed_index.refresh_ids(get_backend(), pkg_ids, cancel)
+        installed_index.save(settings.INSTALLED_PATH)
+
+    return scheduler.submit(task, key=("list", tuple(pkg_ids)), lane=READ, priority=BACKGROUND,
+                            label="Checking installed versions")
+
+def poll_installed():
+    # Poller thread: one background snapshot through the scheduler, waiting for it to finish
+    done = threading.Event()
+    job = refresh_installed(BACKGROUND, lambda job: done.set())
+    done.wait()
+    return job.error is None and job.result is True
+
+def update_installed_column(pkg_ids):
+    upgrades = len(installed_index.upgrades())
+    btn_update.config(text=f"Update installed applications ({upgrades} available)" if upgrades else "Update installed applications")
+    if tree_results is None:
+        return
+    wanted = None if pkg_ids is None else {pkg_id.casefold() for pkg_id in pkg_ids}
+    for item in tree_results.get_children():
+        pkg_id = tree_results.set(item, "ID")
+        if wanted is None or pkg_id.casefold() in wanted:
+            tree_results.set(item, "Installed", installed_index.status(pkg_id))
 
 def back_to_search():
+    global waiting_detail
+    waiting_detail = None
     detail_frame.pack_forget()
     search_frame.pack(fill='both', expand=True)
 
 def show_detail_screen(package_name, description, package_id):
+    build_detail_ui()
     label_pkg_name.config(text=package_name)
     install_btn.config(command=lambda: install_package(package_id))
     uninstall_btn.config(command=lambda: uninstall_package(package_id))
 
     txt_info.config(state='normal')
     txt_info.delete('1.0', tk.END)
-    clean_desc = []
-    for line in description.splitlines():
-        line = line.replace('â€™', "'").replace('â€“', '–').replace('Â©', '©')
-        if line:
-            clean_desc.append(line)
-    txt_info.insert(tk.END, '\n'.join(clean_desc))
+    txt_info.insert(tk.END, description)
     txt_info.config(state='disabled')
 
     search_frame.pack_forget()
     detail_frame.pack(fill='both', expand=True)
 
+def show_loading_screen(package_name, package_id):
+    show_detail_screen(package_name, f"Loading details for {package_id}...", package_id)
+
 def on_package_select(event):
+    global waiting_detail
     selected = tree_results.selection()
     if not selected:
         return
     item_id = selected[0]
-    name, pkg_id, _ = tree_results.item(item_id, 'values')
-    raw = package_details.get(pkg_id, "")
-    if not raw:
-        messagebox.showinfo("Please wait", "Data is still loading... please wait a few seconds")
+    name, pkg_id, version = tree_results.item(item_id, 'values')[:3]
+    record = package_records.get(pkg_id)
+    if record is None:
+        cached = details_cache.get(pkg_id, version)
+        record = cached and parse_show(cached[0], settings.KEEP_RAW_DETAILS)
+        if record:
+            package_records.put(pkg_id, record)
+    if not record:
+        # Not prefetched yet: jump the queue and fill the screen when it arrives
+        waiting_detail = (name, pkg_id)
+        show_loading_screen(name, pkg_id)
+        prefetcher.prioritize(pkg_id)
         return
-
-    lines = [l for l in raw.splitlines() if not re.match(r"^Found\s.+\s\[[^\]]*\]$", l)]
-    desc_lines = []
-    in_desc = False
-    for line in lines:
-        if line.strip().startswith('Description:'):
-            in_desc = True
-            part = line.split('Description:', 1)[1].strip()
-            if part:
-                desc_lines.append(part)
-            continue
-        if in_desc:
-            if line.startswith('  '):
-                desc_lines.append(line.strip())
-            else:
-                break
-
-    description = '\n'.join(desc_lines) if desc_lines else 'Description: Not provided by package.'
-    show_detail_screen(name, description, pkg_id)
-
-def fetch_package_details():
-    for programm_id in all_ids:
-        package_details[programm_id] = run_command(f"winget show {programm_id}")
-
-def search_packages():
-    query = entry_search.get().strip().replace(' ', '')
-    if not query:
-        messagebox.showwarning("Input Error", "Please enter a search term.")
+    waiting_detail = None
+    show_detail_screen(name, format_details(record), pkg_id)
+
+def format_details(record):
+    lines = [record.description or 'Description: Not provided by package.', '']
+    for label, value in (
+        ("Version", record.version),
+        ("Publisher", record.publisher),
+        ("Homepage", record.homepage),
+        ("License", record.license),
+        ("Installer", " · ".join(part for part in (record.installer_type, record.installer_size) if part)),
+        ("Download", record.installer_url),
+        ("Tags", ", ".join(record.tags)),
+    ):
+        if value:
+            lines.append(f"{label}: {value}")
+    return '\n'.join(lines)
+
+def fetch_package_details(programm_id, cancel):
+    # Scheduler thread: returns a PackageRecord, or the error text to show instead
+    code, raw = run_command(lambda cancel: get_backend().show(programm_id, cancel=cancel), cancel)
+    if is_transient((code, raw)):
+        raise TransientError(raw)
+    record = parse_show(raw, settings.KEEP_RAW_DETAILS) if code is not None else None
+    if record is None:
+        return raw or f"No details available for {programm_id}."
+    if code == 0 and not cancel.cancelled:
+        # A failed or cut-off `winget show` must not be served from the cache for a day
+        details_cache.put(programm_id, raw)
+    package_index.add_record(record)
+    return record
+
+def on_details_fetched(gen, programm_id, result):
+    # Runs on the Tk thread; drop results that belong to an older search
+    if gen != prefetcher.generation:
         return
-
-    output = run_command(f'winget search "{query}"')
-    if "No package found" in output or not output.strip():
-        messagebox.showinfo("No Results", "No packages found for your search.")
+    global waiting_detail
+    if isinstance(result, PackageRecord):
+        package_records.put(programm_id, result)
+        update_search_status()
+    if waiting_detail and waiting_detail[1] == programm_id:
+        name, _ = waiting_detail
+        waiting_detail = None
+        show_detail_screen(name, format_details(result) if isinstance(result, PackageRecord) else result, programm_id)
+
+def update_search_status():
+    stats = details_cache.stats()
+    cache_text = f"cache: {stats['hits']} hits, {stats['stale_hits']} stale, {stats['misses']} misses"
+    if search_running:
+        label_search_status.config(text=f"Searching... {len(all_ids)} results so far ({cache_text})")
         return
-
+    if not all_ids:
+        label_search_status.config(text="")
+        return
+    loaded = sum(1 for pkg_id in all_ids if pkg_id in package_records)
+    if prefetcher.busy:
+        label_search_status.config(text=f"{len(all_ids)} results - loading details {loaded}/{len(all_ids)}... ({cache_text})")
+    else:
+        label_search_status.config(text=f"{len(all_ids)} results ({cache_text})")
+
+def reset_results():
+    # Stop the running search and its detail fetches, and empty the results list
+    global waiting_detail, search_gen, search_running
+    if search_job is not None:
+        search_job.cancel()
+    search_gen += 1
+    search_running = False
+    waiting_detail = None
+    prefetcher.start([])
     tree_results.delete(*tree_results.get_children())
     all_ids.clear()
-    package_details.clear()
-    header_passed = False
+    shown_ids.clear()
+
+def show_local_results(query):
+    reset_results()
+    for entry in package_index.search(query, limit=settings.INDEX_RESULTS):
+        all_ids.append(entry.id)
+        shown_ids.add(entry.id)
+        tree_results.insert('', 'end', values=(entry.name, entry.id, entry.version, installed_index.status(entry.id)))
+    update_search_status()
+
+def on_search_typed(event):
+    global search_after_id, last_typed_query
+    query = entry_search.get().strip()
+    if query == last_typed_query:
+        return
+    last_typed_query = query
+    if search_after_id is not None:
+        root.after_cancel(search_after_id)
+        search_after_id = None
+    if not query:
+        reset_results()
+        update_search_status()
+        return
+    # The index answers instantly; winget fills in the rest once typing pauses
+    show_local_results(query)
+    if len(query) >= settings.SEARCH_MIN_CHARS:
+        search_after_id = root.after(settings.SEARCH_DEBOUNCE_MS, start_winget_search, query, False)
+
+def search_packages(event=None):
+    global last_typed_query
+    query = entry_search.get().strip()
+    if not query:
+        messagebox.showwarning("Input Error", "Please enter a search term.")
+        return
+    last_typed_query = query
+    show_local_results(query)
+    start_winget_search(query, True)
+
+def start_winget_search(query, explicit):
+    # A new search kills the previous winget search; rows already shown stay
+    global search_after_id, search_job, search_gen, search_running
+    if search_after_id is not None:
+        root.after_cancel(search_after_id)
+        search_after_id = None
+    if search_job is not None:
+        search_job.cancel()
+    search_gen += 1
+    search_running = True
+    update_search_status()
+    gen = search_gen
+    search_job = scheduler.submit(
+        lambda cancel: run_search(gen, query.replace(' ', ''), cancel, explicit),
+        key=("search", gen),
+        lane=READ,
+        label=f"Searching for {query}",
+        on_done=lambda job: job.token.cancelled or ui_queue.post(finish_search, gen, explicit)
+    )
 
-    for line in output.splitlines():
-        if re.match(r"^-{5,}", line):
-            header_passed = True
-            continue
-        if not header_passed:
+def run_search(gen, query, cancel, explicit):
+    # Worker thread: parse rows as winget prints them and hand them to the UI in batches
+    batcher = Batcher(ui_queue, add_search_rows, gen)
+
+    def on_row(row):
+        # Cached details are parsed here, off the Tk thread
+        package_index.add_row(row)
+        record = fresh = None
+        if row.id not in package_records:
+            cached = details_cache.get(row.id, row.version)
+            if cached:
+                record, fresh = parse_show(cached[0], settings.KEEP_RAW_DETAILS), cached[1]
+        batcher.add((row, record, fresh))
+
+    parser = TableParser(on_row=on_row)
+    result = run_command(lambda cancel: get_backend().search(query, on_line=parser.feed, cancel=cancel), cancel)
+    parser.close()
+    batcher.flush()
+    details_cache.flush()
+    if is_transient(result):
+        # Retried by the scheduler; rows already shown aren't added twice. finish_search runs from on_done
+        raise TransientError(result[1])
+
+def add_search_rows(gen, items):
+    if gen != search_gen:
+        return
+    to_fetch = []
+    for row, record, fresh in items:
+        if row.id not in shown_ids:
+            all_ids.append(row.id)
+            shown_ids.add(row.id)
+            tree_results.insert('', 'end', values=(row.name, row.id, row.version, installed_index.status(row.id)))
+        if row.id in package_records:
             continue
-        cols = re.split(r"\s{2,}", line.strip())
-        if len(cols) >= 3:
-            all_ids.append(cols[1])
-            tree_results.insert('', 'end', values=(cols[0], cols[1], cols[2]))
+        # Cached details show up at once; stale and missing ones are (re)fetched
+        if record:
+            package_records.put(row.id, record)
+        if not record or not fresh:
+            to_fetch.append(row.id)
+    prefetcher.add(to_fetch)
+    update_search_status()
+
+def finish_search(gen, explicit):
+    global search_running
+    if gen != search_gen:
+        return
+    search_running = False
+    update_search_status()
+    # Searches finishing close together share one save; it writes nothing when no entry changed
+    scheduler.submit(lambda cancel: package_index.save(settings.INDEX_PATH), key=("save-index",), lane=READ,
+                     priority=BACKGROUND, label="Saving the search index", retries=0)
+    if not all_ids:
+        if explicit:
+            messagebox.showinfo("No Results", "No packages found for your search.")
+        else:
+            label_search_status.config(text="No packages found.")
 
-    threading.Thread(target=fetch_package_details, daemon=True).start()
+def load_package_index():
+    installed_index.load(settings.INSTALLED_PATH)
+    package_index.add_catalog(get_catalog(PACKAGES_DIR, settings.CATALOG_PATH))
+    package_index.load_dump(settings.INDEX_PATH, learned=True)
+    if settings.INDEX_DUMP:
+        package_index.load_dump(settings.INDEX_DUMP)
+    package_index.compact()
 
 def install_package(pkg_id):
     run_command_live(
-        f"winget install --id {pkg_id} -e --accept-source-agreements --accept-package-agreements",
-        txt_info, install_btn, uninstall_btn
+        lambda on_line, cancel: get_backend().install(pkg_id, on_line=on_line, cancel=cancel),
+        txt_info, install_btn, uninstall_btn, log_name=f"install-{pkg_id}", label=f"Installing {pkg_id}",
+        on_finish=lambda: installed_changed([pkg_id])
     )
 
 def uninstall_package(pkg_id):
     run_command_live(
-        f"winget uninstall --id {pkg_id} -e",
-        txt_info, install_btn, uninstall_btn
+        lambda on_line, cancel: get_backend().uninstall(pkg_id, on_line=on_line, cancel=cancel),
+        txt_info, install_btn, uninstall_btn, log_name=f"uninstall-{pkg_id}", label=f"Uninstalling {pkg_id}",
+        on_finish=lambda: installed_changed([pkg_id])
     )
 
+def startup_probe(window):
+    # WINGUILITE_STARTUP_PROBE: open one window, report how long that took and exit
+    if window == "installer":
+        root.wait_visibility(InstallerApp(root))
+    elif window == "updates":
+        root.wait_visibility(UpdateManagerApp(root))
+    elif window == "search":
+        start_main_app()
+    root.update()
+    print(f"ready {(time.perf_counter() - started) * 1000:.1f} ms", flush=True)
+    root.destroy()
+
 def multi_select_mode():
     InstallerApp(root)
 
 def update_packages_mode():
     UpdateManagerApp(root)
 
+def diagnostics_mode(event=None):
+    DiagnosticsApp(root)
+
+def build_search_ui():
+    # Built the first time the search screen is opened, not at startup
+    global search_frame, option_frame, entry_search, tree_results, label_search_status
+    if search_frame is not None:
+        return
+    search_frame = tk.Frame(root, bg="#f5f6fa")
+
+    search_header = tk.Frame(search_frame, bg='#4078c0', height=48)
+    search_header.pack(fill='x')
+    search_title = tk.Label(search_header, text="WinGUILite - A Lite GUI For Microsoft Winget", font=title_font, bg='#4078c0', fg='white')
+    search_title.pack(side='left', padx=18, pady=8)
+
+    tk.Label(search_frame, text="Search for a package:", font=label_font, bg="#f5f6fa").pack(pady=(18, 0))
+    entry_search = ttk.Entry(search_frame, width=44, font=label_font)
+    entry_search.pack(pady=7)
+    entry_search.bind('<KeyRelease>', on_search_typed)
+    entry_search.bind('<Return>', search_packages)
+    ttk.Button(search_frame, text="Search", command=search_packages).pack(pady=7)
+
+    cols = ("Name", "ID", "Version", "Installed")
+    tree_results = ttk.Treeview(search_frame, columns=cols, show='headings', height=9)
+    for c, width in zip(cols, (250, 230, 110, 130)):
+        tree_results.heading(c, text=c)
+        tree_results.column(c, width=width)
+    tree_results.pack(pady=14, fill='x', padx=18)
+    tree_results.bind('<<TreeviewSelect>>', on_package_select)
+
+    label_search_status = tk.Label(search_frame, text="", font=('Segoe UI', 9), bg="#f5f6fa", fg="#274472")
+    label_search_status.pack(anchor='w', padx=18)
+
+    option_frame = tk.Frame(root, bg="#eaf0fb", bd=1, relief='solid')
+    option_label = tk.Label(option_frame, text="Select and download multiple applications together.", font=label_font, bg="#eaf0fb", fg="#274472")
+    option_label.pack(side='left', padx=18, pady=8)
+
+def build_detail_ui():
+    # Built the first time a package is opened
+    global detail_frame, label_pkg_name, install_btn, uninstall_btn, txt_info
+    if detail_frame is not None:
+        return
+    detail_frame = tk.Frame(root, bg="#f5f6fa")
+    btn_back = ttk.Button(detail_frame, text="⬅ Back", command=back_to_search)
+    btn_back.pack(anchor='nw', padx=18, pady=(18, 0))
+
+    label_pkg_name = tk.Label(detail_frame, text="", font=title_font, bg="#f5f6fa", fg="#274472")
+    label_pkg_name.pack(anchor='nw', padx=18, pady=(0, 8))
+
+    btns_frame = tk.Frame(detail_frame, bg="#f5f6fa")
+    btns_frame.pack(anchor='ne', padx=18, pady=(0, 10))
+    install_btn = ttk.Button(btns_frame, text="Install")
+    install_btn.pack(side='left', padx=4)
+    uninstall_btn = ttk.Button(btns_frame, text="Uninstall")
+    uninstall_btn.pack(side='left', padx=4)
+
+    txt_info = tk.Text(detail_frame, wrap='word', font=('Segoe UI', 10), bg="#f8f9fa", relief='flat', bd=1, highlightthickness=1, highlightbackground="#d1d8e0")
+    txt_info.pack(fill='both', expand=True, padx=18, pady=12)
+    txt_info.config(state='disabled')
+
 def start_main_app():
+    build_search_ui()
     startup_frame.pack_forget()
     option_frame.pack(fill='x', padx=0, pady=(0, 8))
     search_frame.pack(fill='both', expand=True)
@@ -459,6 +976,15 @@ root.title("WinGUILite")
 root.geometry("780x540")
 root.configure(bg="#f5f6fa")
 
+ui_queue = UiQueue(root)
+scheduler = get_scheduler()
+threading.Thread(target=load_package_index, daemon=True).start()
+prefetcher = DetailPrefetcher(
+    fetch_package_details,
+    lambda gen, pkg_id, raw: ui_queue.post(on_details_fetched, gen, pkg_id, raw),
+    scheduler
+)
+
 title_font = font.Font(family='Segoe UI', size=16, weight='bold')
 label_font = font.Font(family='Segoe UI', size=11)
 button_font = font.Font(family='Segoe UI', size=10, weight='bold')
@@ -471,50 +997,6 @@ style.map("Treeview", background=[('selected', '#d6e0f0')])
 style.configure("TButton", font=button_font, padding=6, background="#4078c0", foreground="#fff")
 style.map("TButton", background=[('active', '#274472')])
 
-search_frame = tk.Frame(root, bg="#f5f6fa")
-search_frame.pack(fill='both', expand=True)
-
-search_header = tk.Frame(search_frame, bg='#4078c0', height=48)
-search_header.pack(fill='x')
-search_title = tk.Label(search_header, text="WinGUILite - A Lite GUI For Microsoft Winget", font=title_font, bg='#4078c0', fg='white')
-search_title.pack(side='left', padx=18, pady=8)
-
-tk.Label(search_frame, text="Search for a package:", font=label_font, bg="#f5f6fa").pack(pady=(18, 0))
-entry_search = ttk.Entry(search_frame, width=44, font=label_font)
-entry_search.pack(pady=7)
-ttk.Button(search_frame, text="Search", command=search_packages).pack(pady=7)
-
-cols = ("Name", "ID", "Version")
-tree_results = ttk.Treeview(search_frame, columns=cols, show='headings', height=9)
-for c in cols:
-    tree_results.heading(c, text=c)
-tree_results.pack(pady=14, fill='x', padx=18)
-tree_results.bind('<<TreeviewSelect>>', on_package_select)
-
-detail_frame = tk.Frame(root, bg="#f5f6fa")
-btn_back = ttk.Button(detail_frame, text="⬅ Back", command=back_to_search)
-btn_back.pack(anchor='nw', padx=18, pady=(18, 0))
-
-label_pkg_name = tk.Label(detail_frame, text="", font=title_font, bg="#f5f6fa", fg="#274472")
-label_pkg_name.pack(anchor='nw', padx=18, pady=(0, 8))
-
-btns_frame = tk.Frame(detail_frame, bg="#f5f6fa")
-btns_frame.pack(anchor='ne', padx=18, pady=(0, 10))
-install_btn = ttk.Button(btns_frame, text="Install")
-install_btn.pack(side='left', padx=4)
-uninstall_btn = ttk.Button(btns_frame, text="Uninstall")
-uninstall_btn.pack(side='left', padx=4)
-
-txt_info = tk.Text(detail_frame, wrap='word', font=('Segoe UI', 10), bg="#f8f9fa", relief='flat', bd=1, highlightthickness=1, highlightbackground="#d1d8e0")
-txt_info.pack(fill='both', expand=True, padx=18, pady=12)
-txt_info.config(state='disabled')
-
-option_frame = tk.Frame(root, bg="#eaf0fb", bd=1, relief='solid')
-option_frame.pack(fill='x', padx=0, pady=(0, 8))
-
-option_label = tk.Label(option_frame, text="Select and download multiple applications together.", font=label_font, bg="#eaf0fb", fg="#274472")
-option_label.pack(side='left', padx=18, pady=8)
-
 startup_frame = tk.Frame(root, bg="#eaf0fb", bd=1, relief='solid')
 startup_frame.pack(fill='both', expand=True)
 
@@ -530,7 +1012,30 @@ btn_single.pack(pady=12, ipadx=12, ipady=6)
 btn_update = ttk.Button(startup_frame, text="Update installed applications", style="TButton", command=update_packages_mode)
 btn_update.pack(pady=12, ipadx=12, ipady=6)
 
-option_frame.pack_forget()
-search_frame.pack_forget()
+footer = tk.Frame(root, bg="#f5f6fa")
+footer.pack(side='bottom', fill='x', padx=18, pady=(0, 4))
+label_activity = tk.Label(footer, text="", font=('Segoe UI', 9), bg="#f5f6fa", fg="#57606f", anchor='w')
+label_activity.pack(side='left', fill='x', expand=True)
+ttk.Button(footer, text="Diagnostics", command=diagnostics_mode).pack(side='right')
+root.bind_all('<F12>', diagnostics_mode)
+if settings.TRACE:
+    StallMonitor(root, get_tracer(), threshold_ms=settings.STALL_THRESHOLD_MS).start()
+follow_scheduler(label_activity)
+follow_installed(root, update_installed_column)
+refresh_installed()
+if settings.POLL_INTERVAL:
+    poller = UpdatePoller(
+        poll_installed,
+        settings.POLL_INTERVAL,
+        max_interval=settings.POLL_MAX_INTERVAL,
+        idle_only=settings.POLL_IDLE_ONLY,
+        idle_after=settings.POLL_IDLE_SECONDS
+    )
+    poller.start()
+
+if settings.STARTUP_PROBE:
+    root.after_idle(startup_probe, settings.STARTUP_PROBE)
 
-root.mainloop()
\ No newline at end of file
+root.mainloop()
+details_cache.flush()
+package_index.save(settings.INDEX_PATH)
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Lookup latency of guilite.index.PackageIndex for search-as-you-type.
+
+    python benchmarks/bench_index.py [--entries 1000 20000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from guilite.catalog import build_catalog  # noqa: E402
+from guilite.fake import fake_package  # noqa: E402
+from guilite.index import PackageIndex  # noqa: E402
+
+QUERIES = ["c", "co", "contoso", "contoso stu", "studio 12", "fire", "mozila firefx", "Contoso.Studio0"]
+
+
+def build(entries):
+    index = PackageIndex()
+    for i in range(entries):
+        name, pkg_id, version = fake_package(i)
+        index.add(name, pkg_id, version, tags=("benchmark",))
+    index.add_catalog(build_catalog(os.path.join(ROOT, "packages")))
+    index.compact()
+    return index
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--entries", type=int, nargs="+", default=[1000, 20000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+
+    for entries in args.entries:
+        start = time.perf_counter()
+        index = build(entries)
+        print(f"{entries} entries: built in {(time.perf_counter() - start) * 1000:.0f} ms")
+        for query in QUERIES:
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = index.search(query)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"  {query!r:<20} {len(results):>3} hits  {best * 1000:6.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
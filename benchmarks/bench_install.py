@@ -0,0 +1,56 @@
+"""Wall-clock comparison of sequential, batched (`winget import`) and pipelined installs.
+
+Runs each mode against guilite.fake.FakeWinget. --startup models what every
+winget process pays (opening sources, loading the index); --line-delay models
+download time through the per-line output delay and --install-time the time
+an installer itself runs.
+
+    python benchmarks/bench_install.py [--packages 15] [--startup 1.5] [--fail 2]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from guilite import settings  # noqa: E402
+from guilite.fake import FakeWinget  # noqa: E402
+from guilite.install import install_packages  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--packages", type=int, default=15)
+    ap.add_argument("--startup", type=float, default=1.5, help="seconds per winget process")
+    ap.add_argument("--line-delay", type=float, default=0.005, help="seconds per output line")
+    ap.add_argument("--install-time", type=float, default=1.0, help="seconds each installer runs")
+    ap.add_argument("--fail", type=int, default=1, help="how many packages fail once (transiently)")
+    ap.add_argument("--modes", default="sequential,batch,pipeline")
+    args = ap.parse_args(argv)
+    settings.DOWNLOAD_DIR = tempfile.mkdtemp(prefix="winguilite-bench-")
+
+    pkg_ids = [f"Bench.Package{i}" for i in range(args.packages)]
+    timings = {}
+    for mode in args.modes.split(","):
+        # Injected failures are transient: the per-package retry after the batch succeeds
+        backend = FakeWinget(latency=args.startup, line_delay=args.line_delay, rows=0,
+                             fail_ids=pkg_ids[:args.fail], fail_once=True, install_time=args.install_time)
+        results, seconds = install_packages(backend, pkg_ids, mode)
+        timings[mode] = seconds
+        modes = {}
+        for result in results.values():
+            modes[result["mode"]] = modes.get(result["mode"], 0) + 1
+        print(f"{mode:<10} {seconds:6.2f} s  {len(backend.calls)} winget processes  {modes}")
+    shutil.rmtree(settings.DOWNLOAD_DIR, ignore_errors=True)
+    if "sequential" in timings:
+        for mode, seconds in timings.items():
+            if mode != "sequential":
+                print(f"{mode} speed-up: {timings['sequential'] / seconds:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Micro-benchmark for guilite.parse.TableParser.
+
+Checks the parser against the fixture corpus in benchmarks/fixtures, then
+times it on synthetic `winget upgrade`/`winget list` tables.
+
+    python benchmarks/bench_parse.py [--rows 1000 5000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from guilite.fake import fake_package, table  # noqa: E402
+from guilite.parse import TableParser, parse_table  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+
+
+def check_fixtures():
+    with open(os.path.join(FIXTURES, "expected.json"), "r", encoding="utf-8") as f:
+        expected = json.load(f)
+    failures = 0
+    for name, rows in sorted(expected.items()):
+        with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+            parsed = [list(row) for row in parse_table(f.read())]
+        if parsed != rows:
+            failures += 1
+            print(f"FAIL {name}: expected {len(rows)} rows, parsed {len(parsed)}")
+        else:
+            print(f"ok   {name} ({len(rows)} rows)")
+    return failures
+
+
+def synthetic_upgrade(rows):
+    data = []
+    for i in range(rows):
+        name, pkg_id, version = fake_package(i)
+        data.append((name, pkg_id, version, version + ".1", "winget"))
+    lines = table(["Name", "Id", "Version", "Available", "Source"], data)
+    lines.append(f"{rows} upgrades available.\n")
+    return lines
+
+
+def bench(lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = TableParser()
+        count = sum(1 for _ in parser.feed_all(lines))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count, best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    failures = check_fixtures()
+    for rows in args.rows:
+        count, best = bench(synthetic_upgrade(rows), args.repeat)
+        print(f"{rows:>6} rows: parsed {count} in {best * 1000:.2f} ms ({count / best:,.0f} rows/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""Cold-start time of WinGUILite: catalog loading, imports and time to first window.
+
+    python benchmarks/bench_startup.py [--runs 5] [--windows main installer] [--max-ms 1500]
+
+The window timings start WinGUILite.py with the fake backend and
+WINGUILITE_STARTUP_PROBE, which opens the window, prints how long that took
+and exits; they are skipped when there is no display. With --max-ms the
+exit status is 1 when any median is slower than that.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from guilite.catalog import build_catalog, load_catalog  # noqa: E402
+
+PACKAGES_DIR = os.path.join(ROOT, "packages")
+IMPORTS = "import guilite.settings, guilite.backend, guilite.catalog, guilite.index, guilite.install, guilite.scheduler"
+
+
+def has_display():
+    if sys.platform == "win32":
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def time_process(argv, env, runs):
+    # Wall time from spawn to exit, so interpreter start-up is included
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(argv, env=env, cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        elapsed = (time.perf_counter() - start) * 1000
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(argv)} exited with {proc.returncode}:\n{proc.stdout}")
+        times.append(elapsed)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--repeat", type=int, default=20, help="repeats for the in-process timings")
+    ap.add_argument("--windows", nargs="+", default=["main", "search", "installer", "updates"],
+                    choices=["main", "search", "installer", "updates"])
+    ap.add_argument("--max-ms", type=float, default=None, help="fail when a window median is slower")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        compiled = os.path.join(data_dir, "catalog.json")
+        cold = best_of(lambda: build_catalog(PACKAGES_DIR), args.repeat)
+        load_catalog(PACKAGES_DIR, compiled)
+        warm = best_of(lambda: load_catalog(PACKAGES_DIR, compiled), args.repeat)
+        print(f"catalog: {cold:.2f} ms from packages/*.json, {warm:.2f} ms precompiled")
+
+        env = dict(os.environ, WINGUILITE_BACKEND="fake", WINGUILITE_DATA_DIR=data_dir, WINGUILITE_POLL_INTERVAL="0")
+        imports = time_process([sys.executable, "-c", IMPORTS], env, args.runs)
+        bare = time_process([sys.executable, "-c", "pass"], env, args.runs)
+        print(f"guilite imports: {imports - bare:.0f} ms (interpreter alone {bare:.0f} ms)")
+
+        if not has_display():
+            print("windows: skipped, no display")
+            return 0
+        slow = []
+        for window in args.windows:
+            env["WINGUILITE_STARTUP_PROBE"] = window
+            median = time_process([sys.executable, os.path.join(ROOT, "WinGUILite.py")], env, args.runs)
+            print(f"{window:<10} first window in {median:6.0f} ms (median of {args.runs})")
+            if args.max_ms is not None and median > args.max_ms:
+                slow.append(window)
+    if slow:
+        print(f"slower than {args.max_ms:g} ms: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""Benchmark suite: every hot path at several sizes, with saved baselines.
+
+Stages, each run at every --sizes row count against synthetic winget output:
+
+    parse.search    TableParser + PackageIndex.add_row on `winget search` output
+    parse.upgrade   TableParser + InstalledIndex on a `winget list` table with upgrades
+    detail          parse_show() per package (the detail view), latency per record
+    prefetch        DetailPrefetcher through the scheduler, latency per package
+    ui.tree         Treeview insert of the search results (needs a display)
+    ui.checklist    CheckList.set_rows of a Multi Installer tab (needs a display)
+    install.batch   install_packages() with one `winget import`
+    install.pipeline  install_packages() downloading ahead
+    log             LineSplitter + collapse() on an install log with progress spam (--log-mb)
+
+Install stages are capped at --max-packages and prefetch at --max-prefetch.
+Every stage reports items/s and p50/p90/p99 latency in ms. --save writes the
+results as a JSON baseline; with --baseline the run fails (exit 1) when a
+stage's p50 is more than --threshold slower than the baseline's (and by
+at least --min-ms, so sub-millisecond noise doesn't count).
+
+    python benchmarks/bench_suite.py [--sizes 10 100 1000 10000] [--stages parse detail]
+        [--save baseline.json] [--baseline baseline.json --threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from guilite import settings  # noqa: E402
+from guilite.engine import LineSplitter  # noqa: E402
+from guilite.fake import FakeWinget, fake_package, install_lines, search_lines, show_lines, table  # noqa: E402
+from guilite.index import PackageIndex  # noqa: E402
+from guilite.install import install_packages  # noqa: E402
+from guilite.installed import InstalledIndex  # noqa: E402
+from guilite.logstream import collapse  # noqa: E402
+from guilite.parse import TableParser  # noqa: E402
+from guilite.prefetch import DetailPrefetcher  # noqa: E402
+from guilite.record import parse_show  # noqa: E402
+from guilite.scheduler import Scheduler  # noqa: E402
+from guilite.trace import percentile  # noqa: E402
+
+
+def stats(items, samples, seconds=None):
+    """Throughput and latency percentiles.
+
+    samples are seconds per repeat, or per item when seconds (the time one
+    run over all items took) is given.
+    """
+    ms = [sample * 1000 for sample in samples]
+    if seconds is None:
+        seconds = percentile(samples, 50)
+    return {
+        "items": items,
+        "per_second": round(items / seconds, 1) if seconds else None,
+        "p50_ms": round(percentile(ms, 50), 4),
+        "p90_ms": round(percentile(ms, 90), 4),
+        "p99_ms": round(percentile(ms, 99), 4),
+    }
+
+
+def repeat_times(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def stage_parse_search(size, repeat):
+    lines = search_lines("bench", size)
+
+    def run():
+        index = PackageIndex()
+        parser = TableParser(on_row=index.add_row)
+        for line in lines:
+            parser.feed(line)
+        parser.close()
+
+    return stats(size, repeat_times(run, repeat))
+
+
+def stage_parse_upgrade(size, repeat):
+    data = []
+    for i in range(size):
+        name, pkg_id, version = fake_package(i)
+        data.append((name, pkg_id, version, version + ".1" if i % 4 == 0 else "", "winget"))
+    lines = table(["Name", "Id", "Version", "Available", "Source"], data)
+
+    def run():
+        rows = []
+        parser = TableParser(on_row=rows.append)
+        for line in lines:
+            parser.feed(line)
+        parser.close()
+        index = InstalledIndex()
+        index.replace(rows)
+        index.upgrades()
+
+    return stats(size, repeat_times(run, repeat))
+
+
+def stage_detail(size, repeat):
+    texts = ["".join(show_lines(fake_package(i)[1], fake_package(i)[2])) for i in range(size)]
+    samples = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            parse_show(text)
+            samples.append(time.perf_counter() - start)
+    return stats(size, samples, sum(samples) / repeat)
+
+
+def stage_prefetch(size, repeat, latency=0.001):
+    # Per-package latency from prefetcher.add() until its details arrive
+    backend = FakeWinget(latency=latency, rows=0)
+    pkg_ids = [fake_package(i)[1] for i in range(size)]
+    samples = []
+    walls = []
+    for _ in range(repeat):
+        scheduler = Scheduler(read_workers=6, retries=0)
+        done = threading.Event()
+        arrived = []
+
+        def on_done(gen, pkg_id, result):
+            arrived.append(time.perf_counter())
+            if len(arrived) == size:
+                done.set()
+
+        prefetcher = DetailPrefetcher(lambda pkg_id, cancel: backend.show(pkg_id, cancel=cancel)[1], on_done, scheduler)
+        start = time.perf_counter()
+        prefetcher.start(pkg_ids)
+        done.wait()
+        walls.append(time.perf_counter() - start)
+        samples += [t - start for t in arrived]
+    return stats(size, samples, sum(walls) / repeat)
+
+
+def stage_install(mode):
+    def run(size, repeat):
+        pkg_ids = [f"Bench.Package{i}" for i in range(size)]
+        samples = []
+        for _ in range(repeat):
+            download_dir = tempfile.mkdtemp(prefix="winguilite-suite-")
+            settings.DOWNLOAD_DIR = download_dir
+            backend = FakeWinget(rows=0)
+            start = time.perf_counter()
+            results, _ = install_packages(backend, pkg_ids, mode)
+            samples.append(time.perf_counter() - start)
+            shutil.rmtree(download_dir, ignore_errors=True)
+            if len(results) != size:
+                raise RuntimeError(f"{mode}: {len(results)} of {size} packages finished")
+        return stats(size, samples)
+    return run
+
+
+def synthetic_log(megabytes):
+    # winget redraws its progress bar with "\r", so most of a real log is one long line of frames
+    chunks = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        lines = install_lines(f"Bench.Package{i}", progress_steps=400)
+        text = "".join(line if "MB /" not in line else line.rstrip("\n") + "\r" for line in lines)
+        chunks.append(text)
+        size += len(text.encode("utf-8"))
+        i += 1
+    return "".join(chunks).encode("utf-8")
+
+
+def stage_log(megabytes, repeat, drain=200):
+    data = synthetic_log(megabytes)
+
+    def run():
+        # What the engine and LogPump do: split chunks into lines, fold them per drain
+        splitter = LineSplitter()
+        pending = []
+        last_kind = None
+        for offset in range(0, len(data), 65536):
+            pending += splitter.feed(data[offset:offset + 65536])
+            if len(pending) >= drain:
+                _, _, last_kind = collapse(pending, last_kind)
+                pending = []
+        collapse(pending + splitter.close(), last_kind)
+
+    result = stats(len(data), repeat_times(run, repeat))
+    result["mb_per_second"] = round(result.pop("per_second") / (1024 * 1024), 1)
+    return result
+
+
+def ui_stages():
+    # Tk is only imported here, so the other stages run on machines without it
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception as e:
+        return None, str(e)
+    root.withdraw()
+    from guilite.checklist import CheckList
+
+    def tree(size, repeat):
+        rows = [fake_package(i) for i in range(size)]
+
+        def run():
+            tree = ttk.Treeview(root, columns=("Name", "ID", "Version", "Installed"), show="headings")
+            for name, pkg_id, version in rows:
+                tree.insert("", "end", values=(name, pkg_id, version, ""))
+            root.update_idletasks()
+            tree.destroy()
+
+        return stats(size, repeat_times(run, repeat))
+
+    def checklist(size, repeat):
+        rows = [(name, (name, pkg_id, "")) for name, pkg_id, _ in (fake_package(i) for i in range(size))]
+
+        def run():
+            widget = CheckList(root, ("Name", "ID", "Installed"))
+            widget.set_rows(rows)
+            root.update_idletasks()
+            widget.destroy()
+
+        return stats(size, repeat_times(run, repeat))
+
+    return {"ui.tree": tree, "ui.checklist": checklist}, None
+
+
+def compare(results, baseline, threshold, min_ms=0.0):
+    """[(key, baseline p50, current p50)] for stages slower than threshold allows."""
+    slower = []
+    for key, result in results.items():
+        before = baseline.get("results", {}).get(key)
+        if not before or "p50_ms" not in before:
+            continue
+        if result["p50_ms"] > before["p50_ms"] * (1 + threshold) and result["p50_ms"] - before["p50_ms"] >= min_ms:
+            slower.append((key, before["p50_ms"], result["p50_ms"]))
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--log-mb", type=float, nargs="+", default=[1, 8])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--stages", nargs="+", default=None, help="only stages starting with these names")
+    ap.add_argument("--max-packages", type=int, default=500, help="cap for the install stages")
+    ap.add_argument("--max-prefetch", type=int, default=1000, help="cap for the prefetch stage")
+    ap.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    ap.add_argument("--baseline", metavar="PATH", help="fail when slower than this baseline")
+    ap.add_argument("--threshold", type=float, default=0.25, help="allowed slow-down, 0.25 = 25%%")
+    ap.add_argument("--min-ms", type=float, default=0.5, help="ignore slow-downs smaller than this")
+    args = ap.parse_args(argv)
+
+    stages = {
+        "parse.search": stage_parse_search,
+        "parse.upgrade": stage_parse_upgrade,
+        "detail": stage_detail,
+        "prefetch": stage_prefetch,
+        "install.batch": stage_install("batch"),
+        "install.pipeline": stage_install("pipeline"),
+    }
+    caps = {"prefetch": args.max_prefetch, "install.batch": args.max_packages, "install.pipeline": args.max_packages}
+
+    def wanted(name):
+        return args.stages is None or any(name.startswith(prefix) for prefix in args.stages)
+
+    if any(wanted(name) for name in ("ui.tree", "ui.checklist")):
+        ui, reason = ui_stages()
+        if ui is None:
+            print(f"ui.*: skipped ({reason})")
+        else:
+            stages.update(ui)
+
+    results = {}
+    for name, stage in stages.items():
+        if not wanted(name):
+            continue
+        sizes = sorted({min(size, caps.get(name, size)) for size in args.sizes})
+        for size in sizes:
+            key = f"{name}/{size}"
+            results[key] = stage(size, args.repeat)
+            r = results[key]
+            print(f"{key:<24} {r['per_second']:>12,.0f}/s  p50 {r['p50_ms']:9.3f} ms  "
+                  f"p90 {r['p90_ms']:9.3f} ms  p99 {r['p99_ms']:9.3f} ms")
+    if wanted("log"):
+        for megabytes in args.log_mb:
+            key = f"log/{megabytes:g}MB"
+            results[key] = r = stage_log(megabytes, args.repeat)
+            print(f"{key:<24} {r['mb_per_second']:>10,.1f} MB/s  p50 {r['p50_ms']:9.3f} ms  "
+                  f"p90 {r['p90_ms']:9.3f} ms  p99 {r['p99_ms']:9.3f} ms")
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline saved to {args.save}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.threshold, args.min_ms)
+        for key, before, now in slower:
+            print(f"REGRESSION {key}: p50 {before:.3f} ms -> {now:.3f} ms ({now / before - 1:+.0%})")
+        if slower:
+            return 1
+        print(f"no stage slower than the baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
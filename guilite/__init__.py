@@ -0,0 +1 @@
+# Support modules for WinGUILite (workers, winget helpers, settings).
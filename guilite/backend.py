@@ -0,0 +1,157 @@
+import threading
+
+from . import settings
+from .pipeline import SUCCESS_CODES, local_install_argv
+from .runner import get_runner
+from .trace import get_tracer
+
+AGREEMENTS = ["--accept-source-agreements", "--accept-package-agreements"]
+_QUERIES = {"search", "show", "list"}
+
+
+def trace_kind(args):
+    """(kind, package ID or None) of a winget argument list, for guilite.trace."""
+    kind = args[0] if args else ""
+    if kind == "upgrade" and "--id" not in args:
+        kind = "upgrade-list"
+    return kind, args[args.index("--id") + 1] if "--id" in args else None
+
+
+class PackageManager:
+    """Every winget operation the app performs, on top of a single run().
+
+    Subclasses implement run(args, on_line, cancel), where args is the winget
+    argument list without the executable. It returns (returncode, output);
+    when on_line is given, each output line is passed to it as it arrives.
+    """
+
+    def run(self, args, on_line=None, cancel=None):
+        raise NotImplementedError
+
+    def search(self, query, on_line=None, cancel=None):
+        return self.run(["search", query], on_line, cancel)
+
+    def show(self, pkg_id, cancel=None):
+        return self.run(["show", "--id", pkg_id, "-e"], cancel=cancel)
+
+    def list(self, pkg_id=None, on_line=None, cancel=None):
+        args = ["list"]
+        if pkg_id:
+            args += ["--id", pkg_id, "-e"]
+        return self.run(args + ["--accept-source-agreements"], on_line, cancel)
+
+    def upgrade_list(self, on_line=None, cancel=None):
+        return self.run(["upgrade", "--accept-source-agreements"], on_line, cancel)
+
+    def upgrade(self, pkg_id, silent=True, on_line=None, cancel=None):
+        args = ["upgrade", "--id", pkg_id, "-e"] + AGREEMENTS
+        if silent:
+            args.append("--silent")
+        return self.run(args, on_line, cancel)
+
+    def install(self, pkg_id, silent=False, on_line=None, cancel=None):
+        args = ["install", "--id", pkg_id, "-e"] + AGREEMENTS
+        if silent:
+            args.append("--silent")
+        return self.run(args, on_line, cancel)
+
+    def import_packages(self, path, on_line=None, cancel=None):
+        """Install everything listed in a winget import file in one process."""
+        args = ["import", "-i", path, "--ignore-unavailable", "--ignore-versions"] + AGREEMENTS
+        return self.run(args, on_line, cancel)
+
+    def uninstall(self, pkg_id, on_line=None, cancel=None):
+        return self.run(["uninstall", "--id", pkg_id, "-e"], on_line, cancel)
+
+    def download(self, pkg_id, directory, on_line=None, cancel=None):
+        """Download the installer (and its manifest) into directory."""
+        return self.run(["download", "--id", pkg_id, "-e", "-d", directory] + AGREEMENTS, on_line, cancel)
+
+    def run_installer(self, argv, on_line=None, cancel=None, pkg_id=None):
+        """Run a downloaded installer; returns (returncode, output)."""
+        raise NotImplementedError
+
+    def install_downloaded(self, pkg_id, directory, action="install", on_line=None, cancel=None):
+        """Install from a download() folder, falling back to winget install/upgrade.
+
+        Returns (installed_locally, returncode).
+        """
+        argv = local_install_argv(directory)
+        if argv is not None:
+            try:
+                code, _ = self.run_installer(argv, on_line, cancel, pkg_id)
+            except OSError:
+                # Can't be started from here, e.g. it needs elevation (WinError 740): let winget do it
+                code = None
+            if code in SUCCESS_CODES:
+                return True, code
+            if cancel is not None and cancel.cancelled:
+                return False, code
+        operation = self.upgrade if action == "upgrade" else self.install
+        code, _ = operation(pkg_id, silent=True, on_line=on_line, cancel=cancel)
+        return False, code
+
+
+class WingetBackend(PackageManager):
+    """The real winget, started through the configured runner."""
+
+    def __init__(self, executable="winget", exec_mode=None):
+        self.executable = executable
+        self.exec_mode = exec_mode
+
+    def run(self, args, on_line=None, cancel=None):
+        args = list(args)
+        # Queries get the short timeout; anything that installs can take a while
+        query = args[0] in _QUERIES or (args[0] == "upgrade" and "--id" not in args)
+        timeout = settings.QUERY_TIMEOUT if query else settings.INSTALL_TIMEOUT
+        return self._exec([self.executable] + args, on_line, cancel, timeout, get_tracer().process(*trace_kind(args)))
+
+    def run_installer(self, argv, on_line=None, cancel=None, pkg_id=None):
+        return self._exec(argv, on_line, cancel, settings.INSTALL_TIMEOUT, get_tracer().process("installer", pkg_id))
+
+    def _exec(self, argv, on_line, cancel, timeout, span=None):
+        runner = get_runner(self.exec_mode)
+        code = None
+        try:
+            if on_line is None:
+                code, output = runner.run(argv, cancel, timeout or None, span)
+                return code, output
+            lines = []
+
+            def collect(line):
+                lines.append(line)
+                on_line(line)
+            code = runner.stream(argv, collect, cancel, timeout or None, span)
+            return code, "".join(lines)
+        finally:
+            if span is not None:
+                span.end(code)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the backend selected by settings.BACKEND ("winget" or "fake")."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if settings.BACKEND == "fake":
+                from .fake import FakeWinget
+                _backend = FakeWinget(
+                    latency=settings.FAKE_LATENCY,
+                    rows=settings.FAKE_ROWS,
+                    fail_rate=settings.FAKE_FAIL_RATE,
+                    recordings_dir=settings.FAKE_RECORDINGS
+                )
+            else:
+                _backend = WingetBackend()
+        return _backend
+
+
+def set_backend(backend):
+    """Swap the shared backend, e.g. for a FakeWinget in a benchmark."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
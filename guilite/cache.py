@@ -0,0 +1,139 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+
+_VERSION_RE = re.compile(r"^\s*Version:\s*(\S+)", re.MULTILINE)
+
+
+def show_version(text):
+    match = _VERSION_RE.search(text)
+    return match.group(1) if match else ""
+
+
+class DetailCache:
+    """On-disk cache of `winget show` output, keyed by package ID and version.
+
+    Entries are zlib-compressed rows in a small SQLite file. An entry younger
+    than `ttl` is fresh; up to `stale` seconds past that it is still returned
+    but flagged so the caller can refresh it in the background. The least
+    recently used entries are evicted once there are more than `max_entries`.
+    Access times are kept in memory and written with the next put() or flush().
+    """
+
+    def __init__(self, path, ttl=86400, stale=7 * 86400, max_entries=2000):
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = 0
+        self._accessed = {}
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._create()
+        except (OSError, sqlite3.Error):
+            # Unwritable profile or broken file: keep working without persistence
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create()
+
+    def _create(self):
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " pkg_id TEXT NOT NULL, version TEXT NOT NULL, data BLOB NOT NULL,"
+            " fetched REAL NOT NULL, accessed REAL NOT NULL,"
+            " PRIMARY KEY (pkg_id, version))"
+        )
+        self._db.commit()
+        self.entries = self._db.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+
+    def get(self, pkg_id, version=""):
+        """Return (text, fresh) or None. An empty version matches the newest entry."""
+        now = time.time()
+        with self._lock:
+            try:
+                if version:
+                    row = self._db.execute(
+                        "SELECT version, data, fetched FROM details WHERE pkg_id = ? AND version = ?",
+                        (pkg_id, version)
+                    ).fetchone()
+                else:
+                    row = self._db.execute(
+                        "SELECT version, data, fetched FROM details WHERE pkg_id = ? ORDER BY fetched DESC LIMIT 1",
+                        (pkg_id,)
+                    ).fetchone()
+                if row is None or now - row[2] > self.ttl + self.stale:
+                    self.misses += 1
+                    return None
+                text = zlib.decompress(row[1]).decode("utf-8")
+            except (sqlite3.Error, zlib.error):
+                self.misses += 1
+                return None
+            self._accessed[(pkg_id, row[0])] = now
+            fresh = now - row[2] <= self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return text, fresh
+
+    def put(self, pkg_id, text):
+        now = time.time()
+        data = zlib.compress(text.encode("utf-8"))
+        with self._lock:
+            try:
+                # Eviction below needs the access times of recent reads
+                self._write_accessed()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?, ?)",
+                    (pkg_id, show_version(text), data, now, now)
+                )
+                count = self._db.execute("SELECT COUNT(*) FROM details").fetchone()[0]
+                if count > self.max_entries:
+                    self._db.execute(
+                        "DELETE FROM details WHERE rowid IN ("
+                        " SELECT rowid FROM details ORDER BY accessed LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                    self.evictions += count - self.max_entries
+                    count = self.max_entries
+                self._db.commit()
+                self.entries = count
+            except sqlite3.Error:
+                pass
+
+    def flush(self):
+        """Write the access times of reads since the last put()."""
+        with self._lock:
+            try:
+                if self._write_accessed():
+                    self._db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _write_accessed(self):
+        # Caller holds the lock and commits
+        if not self._accessed:
+            return False
+        self._db.executemany(
+            "UPDATE details SET accessed = ? WHERE pkg_id = ? AND version = ?",
+            [(accessed, pkg_id, version) for (pkg_id, version), accessed in self._accessed.items()]
+        )
+        self._accessed.clear()
+        return True
+
+    def stats(self):
+        # Called from the Tk thread: counters only, never waits for a put() to commit
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self.entries,
+        }
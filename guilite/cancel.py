@@ -0,0 +1,31 @@
+import threading
+
+from .runner import _kill
+
+
+class CancelToken:
+    """Shared cancel flag that also kills every process attached to it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._procs = set()
+        self.cancelled = False
+
+    def attach(self, proc):
+        with self._lock:
+            if not self.cancelled:
+                self._procs.add(proc)
+                return
+        _kill(proc)
+
+    def detach(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            procs = list(self._procs)
+            self._procs.clear()
+        for proc in procs:
+            _kill(proc)
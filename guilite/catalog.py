@@ -0,0 +1,70 @@
+"""The curated packages/*.json files merged into one precompiled catalog.
+
+Reading five small JSON files on every start adds up; the merged
+{category: {name: id}} is written next to the other app data together with
+each source file's size and mtime, and only rebuilt when one of those
+changes (or a file is added or removed).
+"""
+import glob
+import json
+import os
+import threading
+
+
+def _sources(packages_dir):
+    sources = []
+    for path in sorted(glob.glob(os.path.join(packages_dir, "*.json"))):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        sources.append([os.path.basename(path), st.st_mtime_ns, st.st_size])
+    return sources
+
+
+def build_catalog(packages_dir):
+    """Read every packages/*.json into {category: {name: id}}; IDs are stripped."""
+    categories = {}
+    for path in sorted(glob.glob(os.path.join(packages_dir, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        category = os.path.splitext(os.path.basename(path))[0]
+        categories[category] = {name: pkg_id.strip() for name, pkg_id in data.items()}
+    return categories
+
+
+def load_catalog(packages_dir, compiled_path):
+    """The merged catalog, from compiled_path while it matches the source files."""
+    sources = _sources(packages_dir)
+    try:
+        with open(compiled_path, "r", encoding="utf-8") as f:
+            compiled = json.load(f)
+        if compiled.get("sources") == sources:
+            return compiled["categories"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    categories = build_catalog(packages_dir)
+    try:
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        tmp = compiled_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"sources": sources, "categories": categories}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, compiled_path)
+    except OSError:
+        pass
+    return categories
+
+
+_catalogs = {}
+_catalog_lock = threading.Lock()
+
+
+def get_catalog(packages_dir, compiled_path):
+    """load_catalog() once per process; every window shares the result."""
+    with _catalog_lock:
+        if packages_dir not in _catalogs:
+            _catalogs[packages_dir] = load_catalog(packages_dir, compiled_path)
+        return _catalogs[packages_dir]
@@ -0,0 +1,185 @@
+import re
+from tkinter import ttk
+
+CHECKED = "☑"
+UNCHECKED = "☐"
+
+
+def _natural_key(value):
+    # "1.10" sorts after "1.9"; text compares case-insensitively
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part.lower()) for part in re.split(r"(\d+)", value)]
+
+
+class CheckList(ttk.Frame):
+    """Scrollable, sortable, filterable checklist on a single Treeview.
+
+    Rows are (key, values) pairs; which keys are ticked lives in a plain set,
+    so there are no per-row widgets or Tk variables and counting the
+    selection is O(1). on_change(count) runs whenever the selection changes.
+    """
+
+    def __init__(self, master, columns, widths=None, on_change=None, height=10):
+        super().__init__(master)
+        self.columns = tuple(columns)
+        self.on_change = on_change
+        self.checked = set()
+        self._rows = {}            # {key: values}
+        self._hidden = set()       # keys detached by the filter
+        self._filter = ""
+        self._sort = None          # (column index, reverse)
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="tree headings", height=height, selectmode="browse")
+        self.tree.heading("#0", text=UNCHECKED, command=self._toggle_all)
+        self.tree.column("#0", width=36, stretch=False, anchor="center")
+        for i, col in enumerate(self.columns):
+            self.tree.heading(col, text=col, command=lambda i=i: self.sort_by(i))
+            if widths:
+                self.tree.column(col, width=widths[i])
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<space>", self._on_space)
+
+    def __len__(self):
+        return len(self._rows)
+
+    @property
+    def count(self):
+        return len(self.checked)
+
+    def set_rows(self, rows):
+        """Replace all rows with (key, values) pairs, keeping ticks on keys that remain."""
+        self.tree.delete(*self.tree.get_children())
+        self._rows = {}
+        self._hidden.clear()
+        for key, values in rows:
+            self._rows[key] = tuple(values)
+        self.checked &= set(self._rows)
+        for key in self._ordered(self._rows):
+            self._insert(key, "end")
+        self._hidden = {key for key in self._rows if not self._matches(key)}
+        if self._hidden:
+            self.tree.detach(*self._hidden)
+        self._changed()
+
+    def upsert(self, key, values):
+        """Add a row or update one in place."""
+        values = tuple(values)
+        if key in self._rows:
+            self._rows[key] = values
+            self.tree.item(key, values=values)
+        else:
+            self._rows[key] = values
+            self._insert(key, "end")
+        matches = self._matches(key)
+        if matches and key in self._hidden:
+            self._hidden.discard(key)
+            self._reorder()
+        elif not matches and key not in self._hidden:
+            self._hidden.add(key)
+            self.tree.detach(key)
+        elif self._sort is not None:
+            self._reorder()
+
+    def remove(self, key):
+        if key not in self._rows:
+            return
+        del self._rows[key]
+        self.tree.delete(key)
+        self._hidden.discard(key)
+        if key in self.checked:
+            self.checked.discard(key)
+            self._changed()
+
+    def values(self, key):
+        return self._rows[key]
+
+    def keys(self):
+        return list(self._rows)
+
+    def checked_keys(self):
+        """Ticked keys in the order they are listed (hidden ones included)."""
+        return [key for key in self._ordered(self._rows) if key in self.checked]
+
+    def set_checked(self, key, flag):
+        if flag == (key in self.checked) or key not in self._rows:
+            return
+        if flag:
+            self.checked.add(key)
+        else:
+            self.checked.discard(key)
+        self.tree.item(key, text=CHECKED if flag else UNCHECKED)
+        self._changed()
+
+    def check_all(self, flag=True):
+        """Tick or untick every row that passes the current filter."""
+        for key in self._rows:
+            if key not in self._hidden and flag != (key in self.checked):
+                if flag:
+                    self.checked.add(key)
+                else:
+                    self.checked.discard(key)
+                self.tree.item(key, text=CHECKED if flag else UNCHECKED)
+        self._changed()
+
+    def filter(self, text):
+        self._filter = text.strip().lower()
+        self._refilter()
+
+    def sort_by(self, index):
+        reverse = self._sort is not None and self._sort[0] == index and not self._sort[1]
+        self._sort = (index, reverse)
+        for i, col in enumerate(self.columns):
+            arrow = (" ▼" if reverse else " ▲") if i == index else ""
+            self.tree.heading(col, text=col + arrow)
+        self._reorder()
+
+    def _insert(self, key, index):
+        self.tree.insert("", index, iid=key, text=CHECKED if key in self.checked else UNCHECKED,
+                         values=self._rows[key])
+
+    def _ordered(self, keys):
+        if self._sort is None:
+            return list(keys)
+        index, reverse = self._sort
+        return sorted(keys, key=lambda k: _natural_key(str(self._rows[k][index])), reverse=reverse)
+
+    def _reorder(self):
+        # Detach everything in one call, then reattach the visible rows in order
+        visible = [k for k in self._ordered(self._rows) if k not in self._hidden]
+        if self._rows:
+            self.tree.detach(*self._rows)
+        for key in visible:
+            self.tree.move(key, "", "end")
+
+    def _matches(self, key):
+        if not self._filter:
+            return True
+        return any(self._filter in str(value).lower() for value in self._rows[key])
+
+    def _refilter(self):
+        self._hidden = {key for key in self._rows if not self._matches(key)}
+        self._reorder()
+
+    def _changed(self):
+        all_checked = bool(self._rows) and len(self.checked) == len(self._rows)
+        self.tree.heading("#0", text=CHECKED if all_checked else UNCHECKED)
+        if self.on_change is not None:
+            self.on_change(len(self.checked))
+
+    def _toggle_all(self):
+        visible = [k for k in self._rows if k not in self._hidden]
+        self.check_all(not all(k in self.checked for k in visible))
+
+    def _on_click(self, event):
+        if self.tree.identify_region(event.x, event.y) not in ("tree", "cell"):
+            return
+        key = self.tree.identify_row(event.y)
+        if key:
+            self.set_checked(key, key not in self.checked)
+
+    def _on_space(self, event):
+        for key in self.tree.selection():
+            self.set_checked(key, key not in self.checked)
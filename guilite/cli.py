@@ -0,0 +1,276 @@
+"""Headless WinGUILite: install, upgrade and search without any window.
+
+    WinGUILite.exe --install "media/VLC Media Player,browsers/Mozilla Firefox" --output results.json
+    WinGUILite.exe --install-file list.json
+    WinGUILite.exe --upgrade-all
+    WinGUILite.exe --search firefox
+
+The work goes through the same scheduler, install modes and installed-state
+snapshot as the windows, and tkinter is never imported. One JSON document
+with a result and timings per package goes to stdout (or --output); progress
+goes to stderr, and --trace-jsonl/--trace-chrome save the per-process
+timings from guilite.trace. Exit status: 0 when everything succeeded, 1 when a package
+failed, 2 for bad arguments, 130 when interrupted.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+from . import settings
+from .backend import get_backend
+from .cache import DetailCache
+from .catalog import get_catalog
+from .install import ALREADY_INSTALLED, INSTALLED, install_packages, upgrade_packages
+from .installed import InstalledIndex
+from .parse import TableParser
+from .record import installer_types
+from .scheduler import READ, USER, WRITE, get_scheduler
+from .trace import get_tracer
+
+PACKAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), "packages")
+
+
+class UsageError(Exception):
+    pass
+
+
+def resolve(items, catalog):
+    """[(pkg_id, label)] for "category/name" items; anything without a "/" is a winget ID."""
+    resolved = []
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        if "/" not in item:
+            resolved.append((item, item))
+            continue
+        category, name = (part.strip() for part in item.split("/", 1))
+        packages = catalog.get(category.lower())
+        if packages is None:
+            raise UsageError(f"unknown category {category!r} (have: {', '.join(sorted(catalog))})")
+        pkg_id = packages.get(name) or next(
+            (pkg_id for key, pkg_id in packages.items() if key.strip().casefold() == name.casefold()), None)
+        if pkg_id is None:
+            raise UsageError(f"{name!r} is not in {category}")
+        resolved.append((pkg_id, item))
+    return resolved
+
+
+def read_install_file(path):
+    """Items from a JSON install list.
+
+    Accepts a list of items ("category/name" or IDs), {category: [names]}, or
+    a `winget export` file.
+    """
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise UsageError(f"cannot read {path}: {e}")
+    if isinstance(data, list):
+        return [str(item) for item in data]
+    if isinstance(data, dict) and "Sources" in data:
+        return [package["PackageIdentifier"] for source in data["Sources"] for package in source.get("Packages", [])]
+    if isinstance(data, dict):
+        return [f"{category}/{name}" for category, names in data.items() for name in names]
+    raise UsageError(f"{path}: expected a list, {{category: [names]}} or a winget export file")
+
+
+def run_job(func, **submit):
+    """Run func(cancel) through the shared scheduler and wait; Ctrl+C cancels it."""
+    job = get_scheduler().submit(func, **submit)
+    try:
+        # Short waits so KeyboardInterrupt gets through on Windows
+        while not job.wait(0.2):
+            pass
+    except KeyboardInterrupt:
+        job.cancel()
+        job.wait()
+        raise
+    if job.error is not None:
+        raise job.error
+    return job.result
+
+
+def package_results(pkg_ids, labels, results, ok_states):
+    packages = []
+    for pkg_id in pkg_ids:
+        result = {"id": pkg_id}
+        result.update(results.get(pkg_id) or {"state": "not run", "seconds": 0.0})
+        if labels.get(pkg_id, pkg_id) != pkg_id:
+            result["item"] = labels[pkg_id]
+        result["ok"] = result["state"] in ok_states
+        packages.append(result)
+    return packages
+
+
+def pipeline_installer_types(mode):
+    # The windows' `winget show` cache tells the pipeline which packages it needn't download
+    if mode != "pipeline":
+        return None
+    return installer_types(DetailCache(settings.CACHE_PATH, settings.CACHE_TTL, settings.CACHE_STALE,
+                                       settings.CACHE_MAX_ENTRIES))
+
+
+def load_installed():
+    installed = InstalledIndex()
+    installed.load(settings.INSTALLED_PATH)
+    return installed
+
+
+def refresh_installed(installed, pkg_ids=None):
+    # The windows read this snapshot on their next start
+    def task(cancel):
+        if pkg_ids is None:
+            ok = installed.refresh(get_backend(), cancel)
+        else:
+            installed.refresh_ids(get_backend(), pkg_ids, cancel)
+            ok = True
+        if ok:
+            installed.save(settings.INSTALLED_PATH)
+        return ok
+
+    key = ("list",) if pkg_ids is None else ("list", tuple(pkg_ids))
+    return run_job(task, key=key, lane=READ, priority=USER, label="Reading installed applications")
+
+
+def do_search(query, log):
+    rows = []
+    parser = TableParser(on_row=rows.append)
+    start = time.perf_counter()
+    code, _ = run_job(lambda cancel: get_backend().search(query, on_line=parser.feed, cancel=cancel),
+                      key=("search", query), lane=READ, priority=USER, label=f"Searching {query}")
+    parser.close()
+    log(f"search {query!r}: {len(rows)} results")
+    return {
+        "query": query,
+        "seconds": round(time.perf_counter() - start, 3),
+        "returncode": code,
+        "results": [{"name": row.name, "id": row.id, "version": row.version, "source": row.source} for row in rows],
+    }
+
+
+def do_install(resolved, mode, log):
+    labels = dict(resolved)
+    pkg_ids = list(labels)
+
+    def task(cancel):
+        return install_packages(get_backend(), pkg_ids, mode, lambda pkg_id, state: log(f"{pkg_id}: {state}"),
+                                cancel=cancel, installer_type=pipeline_installer_types(mode))
+
+    results, seconds = run_job(task, key=("install", tuple(pkg_ids)), lane=WRITE,
+                               label=f"Installing {len(pkg_ids)} applications", retries=0)
+    return {
+        "mode": mode,
+        "seconds": round(seconds, 3),
+        "packages": package_results(pkg_ids, labels, results, (INSTALLED, ALREADY_INSTALLED)),
+    }
+
+
+def do_upgrade_all(installed, mode, log):
+    start = time.perf_counter()
+    if not refresh_installed(installed):
+        raise RuntimeError("winget list failed")
+    pkg_ids = [row.id for row in installed.upgrades()]
+    log(f"{len(pkg_ids)} upgrades available")
+    versions = {row.id: (row.version, row.available) for row in installed.upgrades()}
+    list_seconds = time.perf_counter() - start
+
+    def task(cancel):
+        return upgrade_packages(get_backend(), pkg_ids, mode, lambda pkg_id, state: log(f"{pkg_id}: {state}"),
+                                cancel=cancel, installer_type=pipeline_installer_types(mode))
+
+    results, seconds = ({}, 0.0)
+    if pkg_ids:
+        results, seconds = run_job(task, key=("upgrade", tuple(pkg_ids)), lane=WRITE,
+                                   label=f"Updating {len(pkg_ids)} applications", retries=0)
+    packages = package_results(pkg_ids, {}, results, (INSTALLED,))
+    for package in packages:
+        package["from"], package["to"] = versions[package["id"]]
+    return {"mode": mode, "list_seconds": round(list_seconds, 3), "seconds": round(seconds, 3), "packages": packages}
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="WinGUILite", description=__doc__.splitlines()[0])
+    ap.add_argument("--install", action="append", default=[], metavar="ITEMS",
+                    help="comma-separated category/name entries from packages/*.json, or winget IDs")
+    ap.add_argument("--install-file", action="append", default=[], metavar="PATH",
+                    help="JSON list of items, {category: [names]} or a winget export file")
+    ap.add_argument("--upgrade-all", action="store_true", help="upgrade every application with an update available")
+    ap.add_argument("--search", action="append", default=[], metavar="QUERY")
+    ap.add_argument("--install-mode", choices=["batch", "sequential", "pipeline"], default=settings.INSTALL_MODE)
+    ap.add_argument("--update-mode", choices=["pipeline", "sequential"], default=settings.UPDATE_MODE)
+    ap.add_argument("--packages-dir", default=PACKAGES_DIR)
+    ap.add_argument("--output", "-o", default="-", help="where the JSON results go (default: stdout)")
+    ap.add_argument("--quiet", "-q", action="store_true", help="no progress on stderr")
+    ap.add_argument("--trace-jsonl", metavar="PATH", help="save one JSON line per process and job")
+    ap.add_argument("--trace-chrome", metavar="PATH", help="save a Chrome/Perfetto trace")
+    return ap
+
+
+def main(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    if not (args.install or args.install_file or args.upgrade_all or args.search):
+        ap.error("nothing to do: give --install, --install-file, --upgrade-all or --search")
+
+    def log(message):
+        if not args.quiet and sys.stderr is not None:
+            print(message, file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    report = {"started": datetime.datetime.now().isoformat(timespec="seconds"), "backend": settings.BACKEND}
+    try:
+        items = [item for value in args.install for item in value.split(",")]
+        for path in args.install_file:
+            items += read_install_file(path)
+        resolved = resolve(items, get_catalog(args.packages_dir, settings.CATALOG_PATH)) if items else []
+    except UsageError as e:
+        ap.error(str(e))
+
+    status = 0
+    try:
+        if args.search:
+            report["search"] = [do_search(query, log) for query in args.search]
+        if resolved:
+            report["install"] = do_install(resolved, args.install_mode, log)
+            installed = load_installed()
+            if installed.taken:
+                # Only patch a full snapshot; a few rows alone would pass for the whole table
+                refresh_installed(installed, [pkg_id for pkg_id, _ in resolved])
+        if args.upgrade_all:
+            report["upgrade"] = do_upgrade_all(load_installed(), args.update_mode, log)
+    except KeyboardInterrupt:
+        report["interrupted"] = True
+        status = 130
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+        status = 1
+    packages = [package for key in ("install", "upgrade") for package in report.get(key, {}).get("packages", [])]
+    report["ok"] = status == 0 and all(package["ok"] for package in packages)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    tracer = get_tracer()
+    if tracer.enabled:
+        report["trace"] = tracer.summary()
+        if args.trace_jsonl:
+            tracer.export_jsonl(args.trace_jsonl)
+        if args.trace_chrome:
+            tracer.export_chrome(args.trace_chrome)
+    if status == 0 and not report["ok"]:
+        status = 1
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        if sys.stdout is not None:
+            print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
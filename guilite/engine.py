@@ -0,0 +1,182 @@
+"""One asyncio event loop, on its own thread, that runs every child process.
+
+Callers on any thread hand it a command and either wait for the result
+(run) or get a concurrent.futures.Future back (submit). At most
+max_processes children run at once; the rest wait their turn without
+holding a thread. Each process can have a timeout and a CancelToken.
+Output is read by the loop, so no reader thread is needed per process.
+A guilite.trace.ProcessSpan passed along is told when the process starts
+and when its output arrives.
+"""
+import asyncio
+import codecs
+import re
+import threading
+
+from .runner import _CREATIONFLAGS, _kill
+
+TIMED_OUT = -2
+CANCELLED = -1
+
+_NEWLINE_RE = re.compile(r"\r\n|\r|\n")
+
+
+class LineSplitter:
+    """Decodes output chunks and splits them the way text-mode pipes do.
+
+    "\\r\\n", "\\r" and "\\n" all end a line and come out as "\\n", so winget's
+    carriage-return progress redraws arrive as separate lines.
+    """
+
+    def __init__(self, encoding="utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)("replace")
+        self._pending = ""
+
+    def feed(self, data):
+        text = self._pending + self._decoder.decode(data)
+        # A trailing "\r" might be the first half of "\r\n"
+        if text.endswith("\r"):
+            text, self._pending = text[:-1], "\r"
+        else:
+            self._pending = ""
+        parts = _NEWLINE_RE.split(text)
+        self._pending = parts.pop() + self._pending
+        return [part + "\n" for part in parts]
+
+    def close(self):
+        text = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        parts = _NEWLINE_RE.split(text)
+        tail = parts.pop()
+        lines = [part + "\n" for part in parts]
+        if tail:
+            lines.append(tail)
+        return lines
+
+
+class _ProcessHandle:
+    # What a CancelToken kills: cancels the task that owns the process
+    def __init__(self, loop, task):
+        self.loop = loop
+        self.task = task
+
+    def kill(self):
+        self.loop.call_soon_threadsafe(self.task.cancel)
+
+
+class AsyncEngine:
+    """Runs child processes on a dedicated event loop thread."""
+
+    def __init__(self, max_processes=8):
+        self.max_processes = max_processes
+        self.loop = asyncio.new_event_loop()
+        self._semaphore = None
+        self.running = 0            # processes alive now
+        self.waiting = 0            # commands queued behind max_processes
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="guilite-engine", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_processes)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the engine loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, argv, on_line=None, timeout=None, cancel=None, span=None):
+        """Run argv from any thread except the loop's; returns (returncode, output)."""
+        return self.submit(self.exec(argv, on_line, timeout, cancel, span)).result()
+
+    async def exec(self, argv, on_line=None, timeout=None, cancel=None, span=None):
+        """Run argv with at most max_processes at a time; returns (returncode, output).
+
+        on_line gets each line as it is read (on the loop thread). The return
+        code is TIMED_OUT or CANCELLED when the process had to be killed.
+        """
+        handle = _ProcessHandle(self.loop, asyncio.current_task())
+        if cancel is not None:
+            cancel.attach(handle)
+        lines = []
+        try:
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            self.running += 1
+            try:
+                return await self._exec(argv, on_line, timeout, lines, span)
+            finally:
+                self.running -= 1
+                self._semaphore.release()
+        except asyncio.CancelledError:
+            return CANCELLED, "".join(lines)
+        finally:
+            if cancel is not None:
+                cancel.detach(handle)
+
+    async def _exec(self, argv, on_line, timeout, lines, span):
+        if span is not None:
+            span.spawning()
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            creationflags=_CREATIONFLAGS
+        )
+        if span is not None:
+            span.spawned()
+        splitter = LineSplitter()
+
+        def emit(new_lines):
+            for line in new_lines:
+                lines.append(line)
+                if on_line is not None:
+                    on_line(line)
+
+        async def pump():
+            while True:
+                data = await process.stdout.read(65536)
+                if not data:
+                    break
+                if span is not None:
+                    span.output(len(data))
+                emit(splitter.feed(data))
+            emit(splitter.close())
+            return await process.wait()
+
+        try:
+            code = await asyncio.wait_for(pump(), timeout)
+        except asyncio.TimeoutError:
+            _kill(process)
+            await process.wait()
+            emit(splitter.close() + [f"Timed out after {timeout:g} seconds.\n"])
+            return TIMED_OUT, "".join(lines)
+        except asyncio.CancelledError:
+            _kill(process)
+            await asyncio.shield(process.wait())
+            raise
+        return code, "".join(lines)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The engine shared by every runner."""
+    global _engine
+    from . import settings
+    with _engine_lock:
+        if _engine is None:
+            _engine = AsyncEngine(max_processes=settings.MAX_PROCESSES)
+        return _engine
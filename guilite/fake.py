@@ -0,0 +1,376 @@
+"""A scriptable stand-in for winget, used for benchmarks and off-Windows runs.
+
+FakeWinget answers the same argument lists WingetBackend would pass to the
+real executable, with output laid out the way winget prints it. Recorded
+output can be replayed from a directory: `<command>--<id or query>.txt` is
+used first, then `<command>.txt`, and anything not recorded is generated.
+"""
+import json
+import os
+import random
+import threading
+
+from .backend import PackageManager, trace_kind
+from .trace import get_tracer
+
+NO_PACKAGE_FOUND = 0x8A150014
+INSTALL_FAILED = 0x8A150006
+IMPORT_INSTALL_FAILED = 0x8A150052
+UPDATE_NOT_APPLICABLE = 0x8A15002B
+
+_VENDORS = ["Contoso", "Fabrikam", "Northwind", "Tailspin", "Litware", "Adatum", "Proseware", "Woodgrove"]
+_WORDS = ["Studio", "Player", "Browser", "Notes", "Sync", "Terminal", "Editor", "Viewer", "Tools", "Runtime"]
+# winget redraws its spinner with "\r"; text-mode pipes turn each frame into a line
+_SPINNER = ["   - \n", "   \\ \n", "   | \n", "   / \n"]
+
+
+def fake_package(index, rng=None):
+    """Return (name, pkg_id, version) for synthetic package number index."""
+    rng = rng or random.Random(index)
+    vendor = _VENDORS[index % len(_VENDORS)]
+    word = _WORDS[(index // len(_VENDORS)) % len(_WORDS)]
+    name = f"{vendor} {word} {index}"
+    if index % 17 == 3:
+        name = f"{vendor}  {word} {index}"            # double space inside the name
+    elif index % 23 == 5:
+        name = f"{vendor} {word} {index} Community Edition with Extras (x64)"
+    pkg_id = f"{vendor}.{word}{index}"
+    version = f"{rng.randint(0, 30)}.{rng.randint(0, 20)}.{rng.randint(0, 9999)}"
+    if index % 29 == 7:
+        version = "< 1.0"
+    return name, pkg_id, version
+
+
+def table(headers, rows, max_width=40):
+    """Lay rows out like winget: header, dashed rule, space-aligned columns."""
+    cells = []
+    for row in rows:
+        cells.append([c if len(c) <= max_width else c[:max_width - 1] + "…" for c in row])
+    widths = [len(h) for h in headers]
+    for row in cells:
+        for i, c in enumerate(row):
+            widths[i] = max(widths[i], len(c))
+    lines = [" ".join(h.ljust(widths[i]) for i, h in enumerate(headers)).rstrip()]
+    lines.append("-" * (sum(widths) + len(widths) - 1))
+    for row in cells:
+        lines.append(" ".join(c.ljust(widths[i]) for i, c in enumerate(row)).rstrip())
+    return [line + "\n" for line in lines]
+
+
+def search_lines(query, rows):
+    if rows <= 0:
+        return ["No package found matching input criteria.\n"]
+    data = []
+    for i in range(rows):
+        name, pkg_id, version = fake_package(i)
+        match = f"Tag: {query.lower()}" if i % 3 == 0 else ""
+        data.append((f"{query} {name}", pkg_id, version, match, "winget"))
+    return _SPINNER + table(["Name", "Id", "Version", "Match", "Source"], data)
+
+
+def show_lines(pkg_id, version="1.0.0"):
+    name = pkg_id.split(".", 1)[-1]
+    publisher = pkg_id.split(".", 1)[0]
+    return [line + "\n" for line in [
+        f"Found {name} [{pkg_id}]",
+        f"Version: {version}",
+        f"Publisher: {publisher}",
+        f"Publisher Url: https://{publisher.lower()}.example.com",
+        f"Author: {publisher} Ltd.",
+        f"Moniker: {name.lower()}",
+        f"Description: {name} is a synthetic package produced by the fake winget backend.",
+        "  It exists so fetch, parse and UI code can be exercised without Windows.",
+        f"Homepage: https://{publisher.lower()}.example.com/{name.lower()}",
+        "License: MIT",
+        "Tags:",
+        "  fake",
+        "  benchmark",
+        "Installer:",
+        "  Installer Type: exe",
+        f"  Installer Url: https://downloads.example.com/{pkg_id}/{version}/setup.exe",
+        "  Installer SHA256: " + "0" * 64,
+    ]]
+
+
+def install_lines(pkg_id, version="1.0.0", progress_steps=20, verb="install"):
+    name = pkg_id.split(".", 1)[-1]
+    lines = [
+        f"Found {name} [{pkg_id}] Version {version}\n",
+        "This application is licensed to you by its owner.\n",
+        "Microsoft is not responsible for, nor does it grant any licenses to, third-party packages.\n",
+        f"Downloading https://downloads.example.com/{pkg_id}/{version}/setup.exe\n",
+    ]
+    total = 48.5
+    for step in range(1, progress_steps + 1):
+        done = total * step / progress_steps
+        bar = "█" * (30 * step // progress_steps)
+        lines.append(f"  {bar.ljust(30, '▒')}  {done:.1f} MB / {total:.1f} MB\n")
+    lines.append("Successfully verified installer hash\n")
+    if verb == "download":
+        lines.append(f"Installer downloaded: {pkg_id}_{version}.exe\n")
+        return lines
+    lines.append("Starting package uninstall...\n" if verb == "uninstall" else "Starting package install...\n")
+    lines.extend(_SPINNER)
+    lines.append("Successfully uninstalled\n" if verb == "uninstall" else "Successfully installed\n")
+    return lines
+
+
+class _FakeProcess:
+    # Lets a CancelToken "kill" a fake command the same way it kills a real one
+    def __init__(self):
+        self.killed = threading.Event()
+
+    def kill(self):
+        self.killed.set()
+
+
+class FakeWinget(PackageManager):
+    """Replays recorded or synthetic winget output.
+
+    latency is paid once per command and line_delay per printed line, both in
+    seconds; install_time is added to every package actually installed, whether
+    through winget or by running a downloaded installer. rows sets how many
+    results search returns and how many packages
+    count as installed; every fourth installed package has an upgrade.
+    fail_rate (0..1) and fail_ids inject failures into show and the mutating
+    commands; with fail_once an ID in fail_ids only fails the first time.
+    progress_steps controls how much progress spam installs print.
+    """
+
+    def __init__(self, latency=0.0, line_delay=0.0, rows=40, fail_rate=0.0, fail_ids=(), fail_once=False,
+                 progress_steps=20, recordings_dir=None, seed=0, install_time=0.0):
+        self.latency = latency
+        self.line_delay = line_delay
+        self.install_time = install_time
+        self.rows = rows
+        self.fail_rate = fail_rate
+        self.fail_ids = set(fail_ids)
+        self.fail_once = fail_once
+        self.progress_steps = progress_steps
+        self.recordings_dir = recordings_dir
+        self.calls = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.installed = {}  # {id: (name, version, available or "")}
+        for i in range(rows):
+            name, pkg_id, version = fake_package(i)
+            available = f"{version}.1" if i % 4 == 0 else ""
+            self.installed[pkg_id] = (name, version, available)
+
+    def _fails(self, pkg_id):
+        with self._lock:
+            if pkg_id in self.fail_ids:
+                if self.fail_once:
+                    self.fail_ids.discard(pkg_id)
+                return True
+            return self._rng.random() < self.fail_rate
+
+    def _recorded(self, command, key=None):
+        if not self.recordings_dir:
+            return None
+        filenames = [f"{command}.txt"]
+        if key:
+            filenames.insert(0, f"{command}--{key}.txt")
+        for filename in filenames:
+            path = os.path.join(self.recordings_dir, filename)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.readlines()
+        return None
+
+    def run(self, args, on_line=None, cancel=None):
+        args = list(args)
+        span = get_tracer().process(*trace_kind(args))
+        code = None
+        try:
+            code, output = self._run(args, on_line, cancel, span)
+            return code, output
+        finally:
+            if span is not None:
+                span.end(code)
+
+    def _run(self, args, on_line, cancel, span):
+        self.calls.append(args)
+        if span is not None:
+            span.spawning()
+            span.spawned()
+        proc = _FakeProcess()
+        if cancel is not None:
+            cancel.attach(proc)
+        try:
+            if proc.killed.wait(self.latency):
+                return -1, ""
+            code, lines = self._respond(args)
+            installs = sum(1 for line in lines if line.startswith("Starting package install"))
+            if installs and self.install_time and proc.killed.wait(self.install_time * installs):
+                return -1, ""
+            out = []
+            for line in lines:
+                if self.line_delay and proc.killed.wait(self.line_delay):
+                    return -1, "".join(out)
+                if proc.killed.is_set():
+                    return -1, "".join(out)
+                out.append(line)
+                if span is not None:
+                    span.output(len(line))
+                if on_line is not None:
+                    on_line(line)
+            return code, "".join(out)
+        finally:
+            if cancel is not None:
+                cancel.detach(proc)
+
+    def _respond(self, args):
+        command = args[0] if args else ""
+        pkg_id = args[args.index("--id") + 1] if "--id" in args else None
+
+        if command == "search":
+            query = args[1] if len(args) > 1 else ""
+            recorded = self._recorded("search", query)
+            return 0, recorded if recorded is not None else search_lines(query, self.rows)
+
+        if command == "show":
+            recorded = self._recorded("show", pkg_id)
+            if recorded is not None:
+                return 0, recorded
+            if self._fails(pkg_id):
+                return NO_PACKAGE_FOUND, ["No package found matching input criteria.\n"]
+            with self._lock:
+                version = self.installed.get(pkg_id, ("", "1.0.0", ""))[1]
+            return 0, show_lines(pkg_id, version)
+
+        if command == "list":
+            recorded = self._recorded("list", pkg_id)
+            if recorded is not None:
+                return 0, recorded
+            with self._lock:
+                items = sorted(self.installed.items())
+            if pkg_id:
+                items = [item for item in items if item[0] == pkg_id]
+                if not items:
+                    return NO_PACKAGE_FOUND, ["No installed package found matching input criteria.\n"]
+            data = [(name, i, version, available, "winget") for i, (name, version, available) in items]
+            return 0, _SPINNER + table(["Name", "Id", "Version", "Available", "Source"], data)
+
+        if command == "upgrade" and pkg_id is None:
+            recorded = self._recorded("upgrade")
+            if recorded is not None:
+                return 0, recorded
+            with self._lock:
+                items = [(i, v) for i, v in sorted(self.installed.items()) if v[2]]
+            data = [(name, i, version, available, "winget") for i, (name, version, available) in items]
+            lines = _SPINNER + table(["Name", "Id", "Version", "Available", "Source"], data)
+            lines.append(f"{len(data)} upgrades available.\n")
+            return 0, lines
+
+        if command == "import":
+            return self._import(args[args.index("-i") + 1])
+
+        if command in ("install", "upgrade", "uninstall", "download"):
+            recorded = self._recorded(command, pkg_id)
+            if recorded is not None:
+                return 0, recorded
+            with self._lock:
+                known = self.installed.get(pkg_id)
+                name, version, available = known or (pkg_id, "1.0.0", "")
+            if command == "install" and known is not None and not available:
+                return UPDATE_NOT_APPLICABLE, [
+                    "Found an existing package already installed. Trying to upgrade the installed package...\n",
+                    "No available upgrade found.\n",
+                    "No newer package versions are available from the configured sources.\n",
+                ]
+            target = available or version
+            lines = install_lines(pkg_id, target, self.progress_steps, verb=command)
+            if command == "download":
+                directory = args[args.index("-d") + 1] if "-d" in args else "."
+                self._write_download(directory, pkg_id, target)
+            if self._fails(pkg_id):
+                lines = lines[:-1] + ["Installer failed with exit code: 1603\n"]
+                return INSTALL_FAILED, lines
+            with self._lock:
+                if command == "uninstall":
+                    self.installed.pop(pkg_id, None)
+                elif command != "download":
+                    self.installed[pkg_id] = (name, target, "")
+            return 0, lines
+
+        return 0, [f"Unrecognized command: {command}\n"]
+
+    def _import(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        pkg_ids = [p["PackageIdentifier"] for source in manifest.get("Sources", []) for p in source.get("Packages", [])]
+        lines = []
+        failed = False
+        for pkg_id in pkg_ids:
+            with self._lock:
+                known = self.installed.get(pkg_id)
+            if known is not None and not known[2]:
+                lines.append(f"Package is already installed: {pkg_id}\n")
+                continue
+            version = known[2] if known else "1.0.0"
+            package_lines = install_lines(pkg_id, version, self.progress_steps)
+            if self._fails(pkg_id):
+                lines.extend(package_lines[:-1] + ["Installer failed with exit code: 1603\n"])
+                failed = True
+                continue
+            lines.extend(package_lines)
+            with self._lock:
+                self.installed[pkg_id] = (known[0] if known else pkg_id, version, "")
+        return (IMPORT_INSTALL_FAILED if failed else 0), lines
+
+    def _write_download(self, directory, pkg_id, version):
+        # What `winget download` leaves behind: the installer plus a merged manifest
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{pkg_id}_{version}_Machine_X64_nullsoft")
+        with open(base + ".exe", "wb") as f:
+            f.write(b"MZ fake installer")
+        with open(base + ".yaml", "w", encoding="utf-8") as f:
+            f.write(f"PackageIdentifier: {pkg_id}\nPackageVersion: {version}\n"
+                    "Installers:\n- Architecture: x64\n  InstallerType: nullsoft\n"
+                    "  InstallerSwitches:\n    Silent: /S\n")
+
+    def run_installer(self, argv, on_line=None, cancel=None, pkg_id=None):
+        span = get_tracer().process("installer", pkg_id)
+        if span is not None:
+            span.spawning()
+            span.spawned()
+        code = None
+        try:
+            code, output = self._run_installer(argv, on_line, cancel)
+            if span is not None and output:
+                span.output(len(output))
+            return code, output
+        finally:
+            if span is not None:
+                span.end(code)
+
+    def _run_installer(self, argv, on_line, cancel):
+        directory = os.path.dirname(argv[2] if argv[0] == "msiexec" else argv[0])
+        pkg_id = version = None
+        for name in os.listdir(directory) if os.path.isdir(directory) else ():
+            if name.endswith(".yaml"):
+                with open(os.path.join(directory, name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.startswith("PackageIdentifier:"):
+                            pkg_id = line.split(":", 1)[1].strip()
+                        elif line.startswith("PackageVersion:"):
+                            version = line.split(":", 1)[1].strip()
+        self.calls.append(list(argv))
+        proc = _FakeProcess()
+        if cancel is not None:
+            cancel.attach(proc)
+        try:
+            if proc.killed.wait(self.install_time):
+                return -1, ""
+        finally:
+            if cancel is not None:
+                cancel.detach(proc)
+        if pkg_id is None or self._fails(pkg_id):
+            return 1603, ""
+        with self._lock:
+            name = self.installed.get(pkg_id, (pkg_id, "", ""))[0]
+            self.installed[pkg_id] = (name, version or "1.0.0", "")
+        if on_line is not None:
+            on_line("Successfully installed\n")
+        return 0, "Successfully installed\n"
@@ -0,0 +1,221 @@
+"""In-memory package index for instant, as-you-type lookups.
+
+Entries come from the curated packages/*.json catalog, from every search row
+and `winget show` result the app sees, and optionally from a bulk dump (a
+JSON list of objects with Name, Id, Version, Moniker and Tags). Lookups use
+a sorted token list for prefixes and a trigram table for fuzzy matches.
+
+Only what the app learned itself (search rows, `winget show` results and the
+entries saved last time) is written back by save(), the most recently seen
+max_saved of them; the catalog and the bulk dump are read from their own
+files on every start.
+"""
+import bisect
+import json
+import os
+import re
+import heapq
+import threading
+from collections import Counter, OrderedDict, namedtuple
+
+IndexEntry = namedtuple("IndexEntry", "name id version moniker tags")
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _tokens(entry):
+    words = set(_TOKEN_RE.findall(entry.name.lower()))
+    words.update(_TOKEN_RE.findall(entry.id.lower()))
+    words.add(entry.id.lower())
+    if entry.moniker:
+        words.add(entry.moniker.lower())
+    for tag in entry.tags:
+        words.add(tag.lower())
+    return words
+
+
+def _trigrams(text):
+    text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PackageIndex:
+    """Thread-safe package index; search() takes a few milliseconds even for tens of thousands of packages."""
+
+    def __init__(self, max_saved=5000):
+        self.max_saved = max_saved
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries = {}     # {id: IndexEntry}
+        self._keys = []        # sorted tokens ...
+        self._ids = []         # ... and the package ID each one belongs to
+        self._unsorted = []    # (token, id) added since the last lookup
+        self._trigrams = {}    # {trigram: set of ids}
+        self._lower_ids = {}   # {lowercase id: id}
+        self._order = {}       # {id: sort key}
+        self._learned = OrderedDict()  # ids save() writes, least recently seen first
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, name, pkg_id, version="", moniker="", tags=(), learned=False):
+        """Add or update an entry; learned ones (seen in winget output) are kept by save()."""
+        self._add(name, pkg_id, version, moniker, tags, learned, learned)
+
+    def _add(self, name, pkg_id, version, moniker, tags, learned, dirty):
+        if not pkg_id or not name:
+            return
+        with self._lock:
+            if learned and self._learn(pkg_id) and dirty:
+                self._dirty = True
+            old = self._entries.get(pkg_id)
+            if old is not None:
+                # Keep what we already knew (e.g. tags from `show`) when a search row comes in
+                moniker = moniker or old.moniker
+                tags = tuple(tags) or old.tags
+                version = version or old.version
+                entry = IndexEntry(name, pkg_id, version, moniker, tuple(tags))
+                if entry == old:
+                    return
+                known = _tokens(old)
+            else:
+                entry = IndexEntry(name, pkg_id, version, moniker, tuple(tags))
+                known = set()
+            self._entries[pkg_id] = entry
+            if dirty:
+                self._dirty = True
+            self._lower_ids[pkg_id.lower()] = pkg_id
+            self._order[pkg_id] = (len(name), name.lower())
+            for token in _tokens(entry) - known:
+                self._unsorted.append((token, pkg_id))
+            for gram in _trigrams(name.lower()) | _trigrams(pkg_id.lower()):
+                self._trigrams.setdefault(gram, set()).add(pkg_id)
+
+    def _learn(self, pkg_id):
+        # Called with the lock held; True when pkg_id wasn't kept for save() yet
+        if pkg_id in self._learned:
+            self._learned.move_to_end(pkg_id)
+            return False
+        self._learned[pkg_id] = None
+        if len(self._learned) > self.max_saved:
+            self._learned.popitem(last=False)
+        return True
+
+    def add_row(self, row):
+        self.add(row.name, row.id, row.version, learned=True)
+
+    def add_record(self, record):
+        """Add a parsed `winget show` result (guilite.record.PackageRecord)."""
+        self.add(record.name, record.id, record.version, record.moniker, record.tags, learned=True)
+
+    def compact(self):
+        """Sort pending tokens now (e.g. after a bulk load) instead of on the next lookup."""
+        with self._lock:
+            self._merge()
+
+    def _merge(self):
+        # Called with the lock held
+        if not self._unsorted:
+            return
+        if len(self._unsorted) < 256:
+            for token, pkg_id in self._unsorted:
+                i = bisect.bisect_right(self._keys, token)
+                self._keys.insert(i, token)
+                self._ids.insert(i, pkg_id)
+        else:
+            pairs = sorted(list(zip(self._keys, self._ids)) + self._unsorted)
+            self._keys = [token for token, _ in pairs]
+            self._ids = [pkg_id for _, pkg_id in pairs]
+        self._unsorted = []
+
+    def _prefix(self, term):
+        lo = bisect.bisect_left(self._keys, term)
+        hi = bisect.bisect_left(self._keys, term + "\uffff", lo)
+        return set(self._ids[lo:hi])
+
+    def search(self, query, limit=50):
+        """Entries whose tokens start with every word of query, then fuzzy matches."""
+        terms = _TOKEN_RE.findall(query.lower())
+        if not terms:
+            return []
+        with self._lock:
+            self._merge()
+            ids = None
+            for term in terms:
+                found = self._prefix(term)
+                ids = found if ids is None else ids & found
+                if not ids:
+                    break
+            q = query.lower().strip()
+            exact = self._lower_ids.get(q)
+            results = [exact] if exact else []
+            results += heapq.nsmallest(limit, (ids or set()) - set(results), key=self._order.__getitem__)
+            results = results[:limit]
+            if len(results) < limit and len(q) >= 3:
+                results += self._fuzzy(q, set(results), limit - len(results))
+            return [self._entries[pkg_id] for pkg_id in results]
+
+    def _fuzzy(self, query, exclude, limit):
+        grams = _trigrams(query)
+        # Trigrams shared by a big part of the index say little and cost the most
+        common = max(500, len(self._entries) // 10)
+        scores = Counter()
+        for gram in grams:
+            ids = self._trigrams.get(gram, ())
+            if len(ids) <= common:
+                scores.update(ids)
+        needed = max(2, len(grams) // 2)
+        best = heapq.nsmallest(
+            limit,
+            (pkg_id for pkg_id, score in scores.items() if score >= needed and pkg_id not in exclude),
+            key=lambda pkg_id: (-scores[pkg_id], self._order[pkg_id])
+        )
+        return best
+
+    def add_catalog(self, categories):
+        """Add the curated {category: {name: id}} catalog (see guilite.catalog)."""
+        for tag, data in categories.items():
+            for name, pkg_id in data.items():
+                self.add(name, pkg_id, tags=(tag,))
+
+    def load_dump(self, path, learned=False):
+        """Add entries from a JSON list of {Name, Id, Version, Moniker, Tags} objects.
+
+        Files written by save() use the same layout; load those with learned
+        so the next save() keeps their entries.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError):
+            return
+        for item in items:
+            item = {k.lower(): v for k, v in item.items()}
+            self._add(
+                item.get("name", ""),
+                item.get("id") or item.get("packageidentifier", ""),
+                item.get("version", ""),
+                item.get("moniker", ""),
+                tuple(item.get("tags") or ()),
+                learned,
+                False
+            )
+
+    def save(self, path):
+        """Write the learned entries, if any changed since the last save."""
+        # Saves from overlapping searches share the .tmp file: one at a time, newest entries last
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                items = [self._entries[pkg_id]._asdict() for pkg_id in self._learned]
+                self._dirty = False
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(items, f, separators=(",", ":"))
+                os.replace(tmp, path)
+            except OSError:
+                pass
@@ -0,0 +1,240 @@
+"""Multi-package installs: one `winget import` for the whole selection.
+
+install_batch() writes the selection to a temporary winget import file,
+runs it once, and follows each package through the combined output.
+Only packages that did not end up installed are retried one at a time.
+install_sequential() is the plain one-process-per-package loop, kept for
+comparison and as the fallback path. install_pipelined() downloads
+several packages at once while installing them one at a time (see
+guilite.pipeline). upgrade_packages() does the same for upgrades.
+"""
+import datetime
+import json
+import os
+import re
+import tempfile
+import time
+
+from . import settings
+from .pipeline import InstallPipeline
+
+INSTALLED = "installed"
+ALREADY_INSTALLED = "already installed"
+FAILED = "failed"
+INSTALLING = "installing"
+
+_FOUND_RE = re.compile(r"^Found\s.+\s\[([^\]]+)\]")
+_ALREADY_RE = re.compile(r"(?:already installed|No available upgrade found|No newer package versions)", re.IGNORECASE)
+_ALREADY_ID_RE = re.compile(r"Package is already installed:\s*(\S+)", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(r"Package not found(?: for import)?:\s*(\S+)", re.IGNORECASE)
+_FAILED_RE = re.compile(r"(?:Installer failed|Installation failed|Installation abandoned)", re.IGNORECASE)
+
+WINGET_SOURCE = {
+    "Argument": "https://cdn.winget.microsoft.com/cache",
+    "Identifier": "Microsoft.Winget.Source_8wekyb3d8bbwe",
+    "Name": "winget",
+    "Type": "Microsoft.PreIndexed.Package",
+}
+
+
+def write_import_file(pkg_ids, path):
+    """Write pkg_ids as a winget import (packages schema 2.0) file."""
+    manifest = {
+        "$schema": "https://aka.ms/winget-packages.schema.2.0.json",
+        "CreationDate": datetime.datetime.now().isoformat(timespec="seconds"),
+        "Sources": [{
+            "Packages": [{"PackageIdentifier": pkg_id} for pkg_id in pkg_ids],
+            "SourceDetails": WINGET_SOURCE,
+        }],
+        "WinGetVersion": "1.6.0",
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+class ImportProgress:
+    """Follows each package through the combined output of `winget import`.
+
+    feed() takes one output line; on_status(pkg_id, state) fires whenever a
+    package changes state. states holds the latest state per package ID.
+    """
+
+    def __init__(self, pkg_ids, on_status=None):
+        self.states = {pkg_id: None for pkg_id in pkg_ids}
+        self._lower = {pkg_id.lower(): pkg_id for pkg_id in pkg_ids}
+        self.on_status = on_status
+        self.current = None
+
+    def _set(self, pkg_id, state):
+        pkg_id = self._lower.get(pkg_id.lower(), pkg_id)
+        if self.states.get(pkg_id) == state:
+            return
+        self.states[pkg_id] = state
+        if self.on_status is not None:
+            self.on_status(pkg_id, state)
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return
+        match = _FOUND_RE.match(line)
+        if match:
+            self.current = match.group(1)
+            self._set(self.current, INSTALLING)
+            return
+        match = _ALREADY_ID_RE.search(line)
+        if match:
+            self._set(match.group(1), ALREADY_INSTALLED)
+            return
+        match = _NOT_FOUND_RE.search(line)
+        if match:
+            self._set(match.group(1), FAILED)
+            return
+        if self.current is None:
+            return
+        if line.startswith("Successfully installed"):
+            self._set(self.current, INSTALLED)
+            self.current = None
+        elif _ALREADY_RE.search(line):
+            self._set(self.current, ALREADY_INSTALLED)
+            self.current = None
+        elif _FAILED_RE.search(line):
+            self._set(self.current, FAILED)
+            self.current = None
+
+    def unfinished(self):
+        return [pkg_id for pkg_id, state in self.states.items() if state not in (INSTALLED, ALREADY_INSTALLED)]
+
+
+def install_sequential(backend, pkg_ids, on_status=None, on_line=None, cancel=None):
+    """Install one package per winget process. Returns {id: {"state", "seconds", "mode"}}."""
+    results = {}
+    for pkg_id in pkg_ids:
+        if cancel is not None and cancel.cancelled:
+            break
+        if on_status is not None:
+            on_status(pkg_id, INSTALLING)
+        start = time.perf_counter()
+        code, output = backend.install(pkg_id, silent=True, on_line=on_line, cancel=cancel)
+        if _ALREADY_RE.search(output):
+            state = ALREADY_INSTALLED
+        else:
+            state = INSTALLED if code == 0 else FAILED
+        results[pkg_id] = {"state": state, "seconds": round(time.perf_counter() - start, 3), "mode": "sequential"}
+        if on_status is not None:
+            on_status(pkg_id, state)
+    return results
+
+
+def install_batch(backend, pkg_ids, on_status=None, on_line=None, cancel=None):
+    """Install pkg_ids with one `winget import`, retrying failures one by one."""
+    if len(pkg_ids) < 2:
+        return install_sequential(backend, pkg_ids, on_status, on_line, cancel)
+    progress = ImportProgress(pkg_ids, on_status)
+    times = {}
+    started = {}
+
+    def track(pkg_id, state):
+        # Per-package time inside the batch: from its "Found" line to its final state
+        if state == INSTALLING:
+            started[pkg_id] = time.perf_counter()
+        elif pkg_id in started:
+            times[pkg_id] = round(time.perf_counter() - started[pkg_id], 3)
+        if on_status is not None:
+            on_status(pkg_id, state)
+
+    def feed(line):
+        progress.feed(line)
+        if on_line is not None:
+            on_line(line)
+
+    progress.on_status = track
+    fd, path = tempfile.mkstemp(prefix="winguilite-import-", suffix=".json")
+    os.close(fd)
+    try:
+        write_import_file(pkg_ids, path)
+        backend.import_packages(path, on_line=feed, cancel=cancel)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    results = {}
+    for pkg_id, state in progress.states.items():
+        if state in (INSTALLED, ALREADY_INSTALLED):
+            results[pkg_id] = {"state": state, "seconds": times.get(pkg_id, 0.0), "mode": "batch"}
+    retry = progress.unfinished()
+    if retry and not (cancel is not None and cancel.cancelled):
+        for pkg_id, result in install_sequential(backend, retry, on_status, on_line, cancel).items():
+            result["mode"] = "fallback"
+            results[pkg_id] = result
+    return {pkg_id: results[pkg_id] for pkg_id in pkg_ids if pkg_id in results}
+
+
+def install_pipelined(backend, pkg_ids, on_status=None, on_progress=None, cancel=None,
+                      action="install", download_dir=None, download_workers=None, installer_type=None):
+    """Download ahead while installing one by one; on_progress gets pipeline snapshots.
+
+    installer_type(pkg_id) lets packages winget has to install anyway skip the download.
+    """
+    def on_event(pkg_id, state, snapshot):
+        if on_status is not None:
+            on_status(pkg_id, state)
+        if on_progress is not None:
+            on_progress(snapshot)
+
+    pipeline = InstallPipeline(backend, download_dir or settings.DOWNLOAD_DIR,
+                               download_workers or settings.DOWNLOAD_WORKERS, on_event, cancel, installer_type)
+    results = {}
+    for pkg_id, result in pipeline.run([(pkg_id, action) for pkg_id in pkg_ids]).items():
+        if result["state"] in (INSTALLED, FAILED):
+            results[pkg_id] = {
+                "state": result["state"],
+                "seconds": result["install_seconds"],
+                "download_seconds": result["download_seconds"],
+                "mode": "pipeline" if result["local"] else "pipeline-winget",
+            }
+    return results
+
+
+def install_packages(backend, pkg_ids, mode="batch", on_status=None, on_line=None, cancel=None, on_progress=None,
+                     installer_type=None):
+    """Install with the given mode; returns (results, wall-clock seconds)."""
+    start = time.perf_counter()
+    if mode == "pipeline":
+        results = install_pipelined(backend, pkg_ids, on_status, on_progress, cancel, installer_type=installer_type)
+    elif mode == "sequential":
+        results = install_sequential(backend, pkg_ids, on_status, on_line, cancel)
+    else:
+        results = install_batch(backend, pkg_ids, on_status, on_line, cancel)
+    return results, time.perf_counter() - start
+
+
+def upgrade_sequential(backend, pkg_ids, on_status=None, on_line=None, cancel=None):
+    """One `winget upgrade` per package. Returns {id: {"state", "seconds", "mode"}}."""
+    results = {}
+    for pkg_id in pkg_ids:
+        if cancel is not None and cancel.cancelled:
+            break
+        if on_status is not None:
+            on_status(pkg_id, INSTALLING)
+        start = time.perf_counter()
+        code, _ = backend.upgrade(pkg_id, silent=True, on_line=on_line, cancel=cancel)
+        state = INSTALLED if code == 0 else FAILED
+        results[pkg_id] = {"state": state, "seconds": round(time.perf_counter() - start, 3), "mode": "sequential"}
+        if on_status is not None:
+            on_status(pkg_id, state)
+    return results
+
+
+def upgrade_packages(backend, pkg_ids, mode="pipeline", on_status=None, on_line=None, cancel=None, on_progress=None,
+                     installer_type=None):
+    """Upgrade with the given mode ("pipeline" or "sequential"); returns (results, wall-clock seconds)."""
+    start = time.perf_counter()
+    if mode == "pipeline":
+        results = install_pipelined(backend, pkg_ids, on_status, on_progress, cancel, action="upgrade",
+                                    installer_type=installer_type)
+    else:
+        results = upgrade_sequential(backend, pkg_ids, on_status, on_line, cancel)
+    return results, time.perf_counter() - start
@@ -0,0 +1,183 @@
+"""What is installed, from one `winget list` snapshot, keyed by package ID.
+
+The whole table is read once in the background and kept in a dict, so every
+view can look up a row in O(1). `winget upgrade` runs alongside it and only
+the IDs in its table count as upgrades: `winget list` also shows an Available
+version for pinned packages and ones whose installed version winget can't
+determine, which `winget upgrade` leaves out. After an install, upgrade or
+uninstall only the packages involved are re-read with `winget list --id`. The snapshot is
+saved between launches so views have something to show right away.
+"""
+import json
+import os
+import threading
+import time
+
+from .parse import PackageRow, TableParser
+
+NOT_INSTALLED = ""
+# `winget list --id` when the package isn't installed
+NO_PACKAGE_FOUND = 0x8A150014
+
+
+def diff_rows(old, new):
+    """(added, removed, changed) IDs between two {id: PackageRow} dicts.
+
+    changed holds IDs in both whose installed or available version differs.
+    """
+    added = [pkg_id for pkg_id in new if pkg_id not in old]
+    removed = [pkg_id for pkg_id in old if pkg_id not in new]
+    changed = [pkg_id for pkg_id, row in new.items()
+               if pkg_id in old and (old[pkg_id].version, old[pkg_id].available) != (row.version, row.available)]
+    return added, removed, changed
+
+
+def _key(pkg_id):
+    # winget IDs are case-insensitive
+    return pkg_id.casefold()
+
+
+class InstalledIndex:
+    """In-memory `winget list` snapshot.
+
+    Each listener(pkg_ids) runs on whichever thread changed the index;
+    pkg_ids is None after a full refresh.
+    """
+
+    def __init__(self):
+        self._rows = {}         # {casefolded id: PackageRow}
+        self._lock = threading.Lock()
+        self.taken = 0.0        # time.time() of the last full snapshot, 0 if none yet
+        self._upgradable = None  # casefolded ids from `winget upgrade`, None if not read yet
+        self.listeners = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, pkg_id):
+        return _key(pkg_id) in self._rows
+
+    def get(self, pkg_id):
+        return self._rows.get(_key(pkg_id))
+
+    def status(self, pkg_id):
+        """Short text for a list column: installed version, with the upgrade if any."""
+        row = self._rows.get(_key(pkg_id))
+        if row is None:
+            return NOT_INSTALLED
+        if row.available:
+            return f"{row.version or '?'} → {row.available}"
+        return row.version or "yes"
+
+    def upgrades(self):
+        """Rows that `winget upgrade` would upgrade, by name."""
+        with self._lock:
+            rows = [row for key, row in self._rows.items()
+                    if row.available and (self._upgradable is None or key in self._upgradable)]
+        return sorted(rows, key=lambda row: row.name.casefold())
+
+    def age(self):
+        return time.time() - self.taken if self.taken else None
+
+    def replace(self, rows, taken=None, upgradable=None):
+        with self._lock:
+            self._rows = {_key(row.id): row for row in rows if row.id}
+            self.taken = taken or time.time()
+            if upgradable is not None:
+                self._upgradable = {_key(pkg_id) for pkg_id in upgradable}
+        self._changed(None)
+
+    def update(self, pkg_id, rows):
+        """Apply `winget list --id pkg_id` rows; no row means it is no longer installed."""
+        row = next((row for row in rows if _key(row.id) == _key(pkg_id)), None)
+        with self._lock:
+            if row is None:
+                self._rows.pop(_key(pkg_id), None)
+            else:
+                self._rows[_key(pkg_id)] = row
+        self._changed({pkg_id})
+
+    def refresh(self, backend, cancel=None):
+        """Take a new full snapshot; keeps the old one if winget fails or is cancelled.
+
+        A failed `winget upgrade` keeps the previous upgrade set.
+        """
+        upgradable = []
+        thread = threading.Thread(target=self._read_upgrades, args=(backend, cancel, upgradable), daemon=True)
+        thread.start()
+        rows = []
+        parser = TableParser(on_row=rows.append, list_layout=True)
+        code, _ = backend.list(on_line=parser.feed, cancel=cancel)
+        parser.close()
+        thread.join()
+        if cancel is not None and cancel.cancelled:
+            return False
+        if code != 0:
+            # A timed-out or failed run may have printed part of the table
+            return False
+        self.replace(rows, upgradable=upgradable[0] if upgradable else None)
+        return True
+
+    def _read_upgrades(self, backend, cancel, result):
+        # Appends the IDs `winget upgrade` lists to result, unless it failed
+        rows = []
+        parser = TableParser(on_row=rows.append, list_layout=True)
+        try:
+            code, _ = backend.upgrade_list(on_line=parser.feed, cancel=cancel)
+        except OSError:
+            return
+        parser.close()
+        if code == 0 or (code == NO_PACKAGE_FOUND and not rows):
+            result.append([row.id for row in rows])
+
+    def refresh_ids(self, backend, pkg_ids, cancel=None):
+        """Re-read pkg_ids; a package whose `winget list` failed keeps its row."""
+        for pkg_id in pkg_ids:
+            if cancel is not None and cancel.cancelled:
+                return
+            rows = []
+            parser = TableParser(on_row=rows.append, list_layout=True)
+            code, _ = backend.list(pkg_id, on_line=parser.feed, cancel=cancel)
+            parser.close()
+            if cancel is not None and cancel.cancelled:
+                return
+            if code == 0 or (code == NO_PACKAGE_FOUND and not rows):
+                self.update(pkg_id, rows)
+
+    def load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            rows = [PackageRow(*row) for row in data["rows"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        with self._lock:
+            if self.taken:
+                return False    # a live snapshot arrived first
+            # Checked and replaced in one go, so a refresh can't land in between and be overwritten
+            self._rows = {_key(row.id): row for row in rows if row.id}
+            self.taken = data.get("taken") or time.time()
+            if data.get("upgradable") is not None:
+                self._upgradable = {_key(pkg_id) for pkg_id in data["upgradable"]}
+        self._changed(None)
+        return True
+
+    def save(self, path):
+        with self._lock:
+            data = {
+                "taken": self.taken,
+                "rows": [list(row) for row in self._rows.values()],
+                "upgradable": sorted(self._upgradable) if self._upgradable is not None else None,
+            }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _changed(self, pkg_ids):
+        for listener in list(self.listeners):
+            listener(pkg_ids)
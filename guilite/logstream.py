@@ -0,0 +1,124 @@
+import queue
+import re
+import threading
+
+_PROGRESS_RE = re.compile(r"[\d.]+\s*[KMG]B\s*/\s*[\d.]+\s*[KMG]B|[█▒]|^\s*\d{1,3}\s*%\s*$")
+_SPINNER_CHARS = {'-', '\\', '|', '/'}
+_FINISHED = object()
+
+
+def classify(line):
+    """Return (kind, text) where kind is "progress", "spinner" or "text"."""
+    if '\r' in line:
+        # A carriage return redraws the current line: keep the last frame only
+        frames = [f for f in line.rstrip('\r\n').split('\r') if f.strip()]
+        return "progress", (frames[-1].strip() if frames else "")
+    text = line.rstrip('\n')
+    stripped = text.strip()
+    if stripped in _SPINNER_CHARS:
+        return "spinner", stripped
+    if _PROGRESS_RE.search(text):
+        return "progress", stripped
+    return "text", text
+
+
+def collapse(lines, last_kind=None):
+    """Fold runs of progress/spinner lines into their newest line.
+
+    Returns (replace_last, texts, last_kind): replace_last tells whether the
+    first text overwrites the line already shown (which had kind last_kind).
+    """
+    texts = []
+    replace_last = False
+    for line in lines:
+        kind, text = classify(line)
+        if kind != "text" and last_kind not in (None, "text"):
+            if texts:
+                texts[-1] = text
+            else:
+                replace_last = True
+                texts.append(text)
+        else:
+            texts.append(text)
+        last_kind = kind
+    return replace_last, texts, last_kind
+
+
+class LogPump:
+    """Streams lines from a worker thread into a Tk Text widget.
+
+    Workers call write() from any thread. The Tk loop drains the queue every
+    1/fps seconds, collapses progress and spinner updates into one line and
+    keeps at most max_lines in the widget. When log_path is set, every raw line
+    is also appended to that file.
+    """
+
+    def __init__(self, widget, max_lines=2000, fps=20, log_path=None):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.interval = max(1, int(1000 / fps))
+        self.log_path = log_path
+        self._queue = queue.SimpleQueue()
+        self._last_kind = None
+        self._line_count = 0
+        self._log_file = None
+        self._log_lock = threading.Lock()
+
+    def start(self):
+        self.widget.config(state='normal')
+        self.widget.delete('1.0', 'end')
+        self.widget.after(self.interval, self._drain)
+
+    def write(self, line):
+        self._queue.put(line)
+        if self.log_path:
+            with self._log_lock:
+                if self._log_file is None:
+                    self._log_file = open(self.log_path, "a", encoding="utf-8")
+                self._log_file.write(line)
+
+    def finish(self, text="", on_done=None):
+        """Queue a closing message; on_done runs on the Tk thread afterwards."""
+        self._queue.put((_FINISHED, text, on_done))
+
+    def _drain(self):
+        lines = []
+        finished = None
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if isinstance(item, tuple) and item[0] is _FINISHED:
+                    finished = item
+                    break
+                lines.append(item)
+        except queue.Empty:
+            pass
+        if lines:
+            self._show(lines)
+        if finished is None:
+            self.widget.after(self.interval, self._drain)
+            return
+        _, text, on_done = finished
+        if text:
+            self.widget.insert('end', text)
+        self.widget.see('end')
+        self.widget.config(state='disabled')
+        with self._log_lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+        if on_done is not None:
+            on_done()
+
+    def _show(self, lines):
+        replace_last, texts, self._last_kind = collapse(lines, self._last_kind)
+        if replace_last and self._line_count:
+            self.widget.delete('end-2l', 'end-1l')
+            self._line_count -= 1
+        self.widget.insert('end', '\n'.join(texts) + '\n')
+        self._line_count += len(texts)
+        if self._line_count > self.max_lines:
+            excess = self._line_count - self.max_lines
+            self.widget.delete('1.0', f'{excess + 1}.0')
+            self._line_count = self.max_lines
+        self.widget.see('end')
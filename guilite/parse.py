@@ -0,0 +1,162 @@
+"""Streaming parser for the tables winget prints (search, list, upgrade).
+
+Column boundaries are taken from where each header word starts, which is how
+winget lays the table out, so names containing double spaces, truncated
+"…" cells and empty columns all parse. Widths are counted in display columns:
+East Asian wide characters take two.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+PackageRow = namedtuple("PackageRow", "name id version available source")
+
+_RULE_RE = re.compile(r"^-{5,}\s*$")
+_FIELDS = {
+    "name": "name",
+    "id": "id",
+    "version": "version",
+    "available": "available",
+    "source": "source",
+}
+
+
+def _widths(text):
+    return [2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text]
+
+
+def _char_offsets(text, columns):
+    # Map display columns to character offsets for lines with wide characters
+    offsets = []
+    pos = 0
+    i = 0
+    widths = _widths(text)
+    for col in columns:
+        while i < len(text) and pos < col:
+            pos += widths[i]
+            i += 1
+        offsets.append(i)
+    return offsets
+
+
+def _clean(line):
+    # Spinner frames are separated by "\r"; only the text after the last one counts
+    if "\r" in line:
+        line = line.rsplit("\r", 1)[-1]
+    return line.rstrip("\r\n")
+
+
+class TableParser:
+    """Feed winget output line by line; feed() returns a PackageRow or None.
+
+    A new table starts at every dashed rule, using the line before it as the
+    header, so multi-table output (e.g. the "require explicit targeting"
+    section of `winget upgrade`) parses too. Footer lines such as
+    "3 upgrades available." are rejected because they don't line up with
+    the header. Each row is held back for one line, in case it turns out to
+    be the next table's header; call close() at the end to get the last one.
+
+    With on_row set, every row is also passed to it, so feed can be handed
+    straight to a backend as its on_line callback.
+
+    Localized headers are read by position: Name, Id, Version and, with five
+    or more columns, Source last. Only with list_layout (`winget list` and
+    `winget upgrade` output) is a fourth of five columns taken as Available;
+    in `winget search` output it is Match.
+    """
+
+    def __init__(self, on_row=None, list_layout=False):
+        self.on_row = on_row
+        self.list_layout = list_layout
+        self._previous = ""
+        self._pending = None
+        self._starts = None
+        self._fields = None
+
+    def feed(self, line):
+        line = _clean(line)
+        if _RULE_RE.match(line):
+            # The line held back as a row was really the header of a new table
+            self._pending = None
+            self._set_header(self._previous)
+            self._previous = ""
+            return None
+        row = self._pending
+        self._pending = None
+        if line.strip():
+            self._previous = line
+            if self._starts is not None:
+                self._pending = self._split(line)
+        if row is not None and self.on_row is not None:
+            self.on_row(row)
+        return row
+
+    def close(self):
+        """Return the last held-back row once the output has ended."""
+        row = self._pending
+        self._pending = None
+        if row is not None and self.on_row is not None:
+            self.on_row(row)
+        return row
+
+    def feed_all(self, lines):
+        for line in lines:
+            row = self.feed(line)
+            if row is not None:
+                yield row
+        row = self.close()
+        if row is not None:
+            yield row
+
+    def _set_header(self, header):
+        starts = [m.start() for m in re.finditer(r"\S+", header)]
+        names = [m.group().lower() for m in re.finditer(r"\S+", header)]
+        if not header.isascii():
+            # Header positions are needed in display columns
+            widths = _widths(header)
+            starts = [sum(widths[:s]) for s in starts]
+        if len(starts) < 2:
+            self._starts = None
+            return
+        fields = [_FIELDS.get(n) for n in names]
+        if fields[0] is None or fields[1] is None:
+            # Localized header: fall back to winget's fixed column order
+            fields = ["name", "id", "version"][:len(starts)] + [None] * (len(starts) - 3)
+            if len(starts) >= 5:
+                fields[-1] = "source"
+                if len(starts) == 5 and self.list_layout:
+                    fields[3] = "available"
+        self._starts = starts
+        self._fields = fields
+
+    def _split(self, line):
+        starts = self._starts
+        if line.isascii():
+            offsets = starts
+        else:
+            offsets = _char_offsets(line, starts)
+        # The ID column must start right after a space, or this isn't a table row
+        id_at = offsets[1]
+        if id_at >= len(line) or line[id_at - 1] != " " or line[id_at] == " ":
+            return None
+        values = {}
+        bounds = offsets + [len(line)]
+        for i, field in enumerate(self._fields):
+            if field is not None:
+                values[field] = line[bounds[i]:bounds[i + 1]].strip()
+        name = values.get("name", "")
+        pkg_id = values.get("id", "")
+        if not name or not pkg_id or " " in pkg_id:
+            return None
+        return PackageRow(
+            name,
+            pkg_id,
+            values.get("version", ""),
+            values.get("available", ""),
+            values.get("source", "")
+        )
+
+
+def parse_table(text, list_layout=False):
+    """Parse complete winget table output into a list of PackageRow."""
+    return list(TableParser(list_layout=list_layout).feed_all(text.splitlines()))
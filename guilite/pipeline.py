@@ -0,0 +1,233 @@
+"""Two-stage install pipeline: concurrent downloads feeding serialized installs.
+
+Downloads (`winget download` into a per-package folder) run on a small pool
+of threads; the calling thread installs each package from its local files
+as soon as it is ready, so installing one package overlaps with downloading
+the next ones. A package whose download fails, or whose installer can't be
+run directly, is installed the normal way instead. Packages already known
+(from `winget show`) to have such an installer skip the download, so winget
+doesn't fetch them twice.
+"""
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+
+QUEUED = "queued"
+DOWNLOADING = "downloading"
+READY = "ready"
+INSTALLING = "installing"
+INSTALLED = "installed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# msiexec / installer exit codes that mean success (3010, 1641: reboot required)
+SUCCESS_CODES = {0, 3010, 1641}
+
+# Installer types local_install_argv() never runs itself. Plain exe installers still
+# download: their silent switches are only known from the downloaded manifest
+WINGET_ONLY_TYPES = {"msix", "appx", "zip", "portable", "msstore", "font", "pwa"}
+
+_DEFAULT_SWITCHES = {
+    "inno": ["/VERYSILENT", "/SUPPRESSMSGBOXES", "/NORESTART", "/SP-"],
+    "nullsoft": ["/S"],
+    "burn": ["/quiet", "/norestart"],
+}
+
+
+def find_download(directory):
+    """Return (installer path, installer type, silent switches) from a `winget download` folder."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return None, "", []
+    manifest = next((n for n in names if n.lower().endswith((".yaml", ".yml"))), None)
+    installer = next((n for n in names if not n.lower().endswith((".yaml", ".yml"))), None)
+    if installer is None:
+        return None, "", []
+    installer_type = os.path.splitext(installer)[1].lstrip(".").lower()
+    silent = []
+    if manifest is not None:
+        try:
+            with open(os.path.join(directory, manifest), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            text = ""
+        match = re.search(r"^\s*InstallerType:\s*(\S+)", text, re.MULTILINE)
+        if match:
+            installer_type = match.group(1).strip("'\"").lower()
+        match = re.search(r"^\s*Silent:\s*(.+)$", text, re.MULTILINE)
+        if match:
+            silent = match.group(1).strip().strip("'\"").split()
+    return os.path.join(directory, installer), installer_type, silent
+
+
+def local_install_argv(directory):
+    """The command that runs a downloaded installer silently, or None if we can't."""
+    path, installer_type, silent = find_download(directory)
+    if path is None:
+        return None
+    if installer_type in ("msi", "wix"):
+        return ["msiexec", "/i", path, "/qn", "/norestart"] + silent
+    if silent:
+        return [path] + silent
+    if installer_type in _DEFAULT_SWITCHES:
+        return [path] + _DEFAULT_SWITCHES[installer_type]
+    # msix, zip, portable and plain exe without known switches go through winget
+    return None
+
+
+class InstallPipeline:
+    """Runs [(pkg_id, action)] jobs, action being "install" or "upgrade".
+
+    on_event(pkg_id, state, snapshot) is called from worker threads whenever a
+    package moves between stages; snapshot() reports queue depths and timings.
+    installer_type(pkg_id), if given, returns the installer type from the
+    package's `winget show` details ("" when unknown).
+    """
+
+    def __init__(self, backend, download_dir, download_workers=3, on_event=None, cancel=None, installer_type=None):
+        self.backend = backend
+        self.installer_type = installer_type
+        self.download_dir = download_dir
+        self.download_workers = download_workers
+        self.on_event = on_event
+        self.cancel = cancel
+        self._lock = threading.Lock()
+        self._to_download = queue.Queue()
+        self._ready = queue.Queue()
+        self.state = {}            # {id: QUEUED .. FAILED}
+        self.download_seconds = {}
+        self.install_seconds = {}
+        self.installing = None
+
+    def snapshot(self):
+        with self._lock:
+            states = list(self.state.values())
+            downloads = list(self.download_seconds.values())
+            installs = list(self.install_seconds.values())
+            installing = self.installing
+        return {
+            "queued": states.count(QUEUED),
+            "downloading": states.count(DOWNLOADING),
+            "ready": states.count(READY),
+            "installing": installing,
+            "done": sum(1 for s in states if s in (INSTALLED, FAILED, CANCELLED)),
+            "total": len(states),
+            "avg_download": sum(downloads) / len(downloads) if downloads else 0.0,
+            "avg_install": sum(installs) / len(installs) if installs else 0.0,
+        }
+
+    def _set(self, pkg_id, state):
+        with self._lock:
+            self.state[pkg_id] = state
+        if self.on_event is not None:
+            self.on_event(pkg_id, state, self.snapshot())
+
+    def _winget_only(self, pkg_id):
+        if self.installer_type is None:
+            return False
+        try:
+            installer_type = self.installer_type(pkg_id) or ""
+        except Exception:
+            return False
+        return installer_type.strip().lower() in WINGET_ONLY_TYPES
+
+    def _cancelled(self):
+        return self.cancel is not None and self.cancel.cancelled
+
+    def _download_worker(self):
+        while True:
+            try:
+                pkg_id, action = self._to_download.get_nowait()
+            except queue.Empty:
+                return
+            if self._cancelled():
+                self._ready.put((pkg_id, action, None))
+                continue
+            self._set(pkg_id, DOWNLOADING)
+            target = os.path.join(self.download_dir, re.sub(r"[^\w.+-]", "_", pkg_id))
+            shutil.rmtree(target, ignore_errors=True)
+            start = time.perf_counter()
+            try:
+                code, _ = self.backend.download(pkg_id, target, cancel=self.cancel)
+            except Exception:
+                code = -1
+            with self._lock:
+                self.download_seconds[pkg_id] = time.perf_counter() - start
+            if code != 0:
+                shutil.rmtree(target, ignore_errors=True)
+                target = None
+            self._set(pkg_id, READY)
+            self._ready.put((pkg_id, action, target))
+
+    def run(self, jobs):
+        """Run all jobs; returns {id: {"state", "download_seconds", "install_seconds", "local"}}."""
+        downloads = 0
+        for pkg_id, action in jobs:
+            if self._winget_only(pkg_id):
+                # Installs through winget while the others download
+                self.state[pkg_id] = READY
+                self._ready.put((pkg_id, action, None))
+                continue
+            self.state[pkg_id] = QUEUED
+            self._to_download.put((pkg_id, action))
+            downloads += 1
+        os.makedirs(self.download_dir, exist_ok=True)
+        workers = [threading.Thread(target=self._download_worker, daemon=True)
+                   for _ in range(min(self.download_workers, downloads))]
+        for worker in workers:
+            worker.start()
+
+        results = {}
+        for _ in range(len(jobs)):
+            pkg_id, action, directory = self._ready.get()
+            if self._cancelled():
+                self._set(pkg_id, CANCELLED)
+                if directory is not None:
+                    shutil.rmtree(directory, ignore_errors=True)
+                results[pkg_id] = {"state": CANCELLED}
+                continue
+            with self._lock:
+                self.installing = pkg_id
+            self._set(pkg_id, INSTALLING)
+            start = time.perf_counter()
+            local = False
+            try:
+                if directory is not None:
+                    local, code = self.backend.install_downloaded(pkg_id, directory, action, cancel=self.cancel)
+                elif action == "upgrade":
+                    code, _ = self.backend.upgrade(pkg_id, silent=True, cancel=self.cancel)
+                else:
+                    code, _ = self.backend.install(pkg_id, silent=True, cancel=self.cancel)
+            except Exception:
+                code = -1
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.install_seconds[pkg_id] = seconds
+                self.installing = None
+            state = INSTALLED if code in SUCCESS_CODES else FAILED
+            self._set(pkg_id, state)
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+            results[pkg_id] = {
+                "state": state,
+                "download_seconds": round(self.download_seconds.get(pkg_id, 0.0), 3),
+                "install_seconds": round(seconds, 3),
+                "local": local,
+            }
+        return {pkg_id: results[pkg_id] for pkg_id, _ in jobs if pkg_id in results}
+
+
+def describe(snapshot):
+    """One status line for a pipeline snapshot."""
+    parts = [f"Done {snapshot['done']}/{snapshot['total']}"]
+    if snapshot["installing"]:
+        parts.append(f"installing {snapshot['installing']}")
+    parts.append(f"downloading {snapshot['downloading']} ({snapshot['queued']} queued)")
+    parts.append(f"{snapshot['ready']} ready")
+    if snapshot["avg_download"] or snapshot["avg_install"]:
+        parts.append(f"avg download {snapshot['avg_download']:.1f}s / install {snapshot['avg_install']:.1f}s")
+    return " · ".join(parts)
@@ -0,0 +1,93 @@
+"""Background polling for available upgrades.
+
+UpdatePoller calls refresh() every interval seconds on its own thread. A
+failed refresh doubles the wait (up to max_interval) and every wait is
+jittered, so a broken network doesn't get hammered and several windows or
+machines don't poll in step. With idle_only, a due poll is put off until
+nobody has touched the keyboard or mouse for idle_after seconds.
+"""
+import ctypes
+import random
+import sys
+import threading
+
+
+def idle_seconds():
+    """Seconds since the last keyboard or mouse input, or None where we can't tell."""
+    if sys.platform != "win32":
+        return None
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+    if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+        return None
+    # Both tick counts are 32-bit and wrap after 49.7 days
+    return ((ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+
+class UpdatePoller:
+    """Keeps the upgrade list fresh in the background.
+
+    refresh() does one refresh and returns True on success. What changed is
+    reported by whatever refresh() updates (the installed-state snapshot and
+    its listeners), not by the poller.
+    """
+
+    def __init__(self, refresh, interval, max_interval=None, jitter=0.2,
+                 idle_only=False, idle_after=120, idle=idle_seconds):
+        self.refresh = refresh
+        self.interval = interval
+        self.max_interval = max_interval or interval * 8
+        self.jitter = jitter
+        self.idle_only = idle_only
+        self.idle_after = idle_after
+        self.idle = idle
+        self.polls = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def next_delay(self):
+        base = min(self.max_interval, self.interval * 2 ** self.failures)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _run(self):
+        delay = self.next_delay()
+        while True:
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            if self.idle_only:
+                idle = self.idle()
+                if idle is not None and idle < self.idle_after:
+                    # Check again once the user could have been away long enough
+                    delay = max(5.0, self.idle_after - idle)
+                    continue
+            self.poll()
+            delay = self.next_delay()
+
+    def poll(self):
+        try:
+            ok = self.refresh()
+        except Exception:
+            ok = False
+        self.polls += 1
+        if not ok:
+            self.failures += 1
+            return False
+        self.failures = 0
+        return True
@@ -0,0 +1,79 @@
+import threading
+
+from .scheduler import BACKGROUND, DONE, FAILED, PENDING, READ, RUNNING, USER
+
+
+class DetailPrefetcher:
+    """Fetches package details as background jobs on the shared Scheduler.
+
+    Every call to start() opens a new generation: the previous generation's
+    jobs are cancelled, which drops the queued ones and kills running fetches.
+    Results are handed to on_done(gen, pkg_id, text) from the scheduler thread,
+    so the caller decides how to get back to the UI.
+
+    An ID is fetched at most once at a time per generation; asking again once
+    its job has finished (say, after a failed `show`) fetches it again.
+    prioritize() moves its job ahead of all background work.
+    """
+
+    def __init__(self, fetch, on_done, scheduler):
+        self.fetch = fetch          # fetch(pkg_id, cancel_token) -> text
+        self.on_done = on_done
+        self.scheduler = scheduler
+        self.generation = 0
+        self._jobs = {}             # {pkg_id: Job} for the current generation
+        self._lock = threading.Lock()
+
+    def start(self, pkg_ids):
+        self.cancel()
+        self.add(pkg_ids)
+        return self.generation
+
+    @property
+    def busy(self):
+        """True while IDs are queued or being fetched."""
+        with self._lock:
+            return any(job.state in (PENDING, RUNNING) for job in self._jobs.values())
+
+    def add(self, pkg_ids):
+        """Queue more IDs for the current generation."""
+        for pkg_id in pkg_ids:
+            self._submit(pkg_id, BACKGROUND)
+
+    def cancel(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs = {}
+            self.generation += 1
+        for job in jobs:
+            job.cancel()
+
+    def prioritize(self, pkg_id):
+        """Fetch pkg_id next unless it is already being fetched."""
+        self._submit(pkg_id, USER)
+
+    def _submit(self, pkg_id, priority):
+        with self._lock:
+            job = self._jobs.get(pkg_id)
+            if job is not None and job.state in (DONE, FAILED):
+                # Finished results aren't kept here; the caller asks again only when it has none
+                job = None
+            if job is not None:
+                if priority == USER and job.state == PENDING:
+                    self.scheduler.submit(job.func, key=job.key, lane=READ, priority=USER)
+                return
+            gen = self.generation
+            self._jobs[pkg_id] = self.scheduler.submit(
+                lambda token: self.fetch(pkg_id, token),
+                key=("show", pkg_id, gen),
+                lane=READ,
+                priority=priority,
+                label=f"Loading details for {pkg_id}",
+                on_done=lambda job: self._done(gen, pkg_id, job)
+            )
+
+    def _done(self, gen, pkg_id, job):
+        if job.token.cancelled:
+            return
+        text = job.result if job.error is None else f"Error executing command: {job.error}"
+        self.on_done(gen, pkg_id, text)
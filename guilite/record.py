@@ -0,0 +1,153 @@
+"""`winget show` output parsed once into a compact record.
+
+parse_show() turns the text into a PackageRecord (a namedtuple, so no
+per-instance dict); the raw text is only kept when asked for. RecordStore
+holds the records for the packages on screen, evicting the least recently
+used beyond max_entries.
+"""
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+PackageRecord = namedtuple(
+    "PackageRecord",
+    "name id version publisher author moniker description homepage license license_url "
+    "release_notes_url installer_type installer_url installer_size tags raw"
+)
+
+_FOUND_RE = re.compile(r"^Found\s(.+)\s\[([^\]]*)\]")
+_KEY_RE = re.compile(r"^(\S[^:]*):\s*(.*)$")
+# A UTF-8 lead byte followed by a continuation byte, both as cp1252 shows them
+_CONTINUATION = bytes(range(0x80, 0xC0)).decode("cp1252", errors="ignore")
+_MOJIBAKE_RE = re.compile("[ÂÃâ][" + re.escape(_CONTINUATION) + "]")
+
+_TOP_FIELDS = {
+    "version": "version",
+    "publisher": "publisher",
+    "author": "author",
+    "moniker": "moniker",
+    "homepage": "homepage",
+    "license": "license",
+    "license url": "license_url",
+    "release notes url": "release_notes_url",
+}
+_INSTALLER_FIELDS = {
+    "installer type": "installer_type",
+    "installer url": "installer_url",
+    "installer size": "installer_size",
+    "size": "installer_size",
+}
+
+
+def fix_mojibake(text):
+    """Undo UTF-8 text that was decoded as cp1252 ("â€™" -> "’")."""
+    if not _MOJIBAKE_RE.search(text):
+        return text
+    try:
+        return text.encode("cp1252").decode("utf-8")
+    except UnicodeError:
+        # Mixed text: repair line by line, leaving lines that don't round-trip alone
+        lines = []
+        for line in text.split("\n"):
+            try:
+                lines.append(line.encode("cp1252").decode("utf-8") if _MOJIBAKE_RE.search(line) else line)
+            except UnicodeError:
+                lines.append(line)
+        return "\n".join(lines)
+
+
+def parse_show(text, keep_raw=False):
+    """Parse `winget show` output; None if it doesn't describe a package."""
+    text = fix_mojibake(text)
+    fields = dict.fromkeys(PackageRecord._fields, "")
+    description = []
+    tags = []
+    section = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if line.startswith(" "):
+            # Continuation of a multi-line value, a Tags entry or an Installer sub-field
+            if section == "description":
+                description.append(line.strip())
+            elif section == "tags":
+                tags.append(line.strip())
+            elif section == "installer":
+                match = _KEY_RE.match(line.strip())
+                if match and match.group(1).lower() in _INSTALLER_FIELDS:
+                    fields[_INSTALLER_FIELDS[match.group(1).lower()]] = match.group(2).strip()
+            continue
+        section = None
+        match = _FOUND_RE.match(line)
+        if match:
+            fields["name"], fields["id"] = match.group(1).strip(), match.group(2)
+            continue
+        match = _KEY_RE.match(line)
+        if not match:
+            continue
+        key, value = match.group(1).lower(), match.group(2).strip()
+        if key == "description":
+            section = "description"
+            if value:
+                description.append(value)
+        elif key == "tags":
+            section = "tags"
+        elif key == "installer":
+            section = "installer"
+        elif key in _TOP_FIELDS:
+            fields[_TOP_FIELDS[key]] = value
+    if not fields["id"]:
+        return None
+    fields["description"] = "\n".join(description)
+    fields["tags"] = tuple(tags)
+    fields["raw"] = text if keep_raw else None
+    return PackageRecord(**fields)
+
+
+class RecordStore:
+    """Thread-safe, bounded {pkg_id: PackageRecord} with LRU eviction."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, pkg_id):
+        return pkg_id in self._records
+
+    def get(self, pkg_id):
+        with self._lock:
+            record = self._records.get(pkg_id)
+            if record is not None:
+                self._records.move_to_end(pkg_id)
+            return record
+
+    def put(self, pkg_id, record):
+        with self._lock:
+            self._records[pkg_id] = record
+            self._records.move_to_end(pkg_id)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+def installer_types(cache, records=None):
+    """Installer type lookup for guilite.pipeline.
+
+    Returns installer_type(pkg_id): the type from a parsed record in records
+    (a RecordStore) or from cached `winget show` text in cache (a
+    DetailCache), "" when neither has the package.
+    """
+    def installer_type(pkg_id):
+        record = records.get(pkg_id) if records is not None else None
+        if record is None:
+            cached = cache.get(pkg_id)
+            record = parse_show(cached[0]) if cached else None
+        return record.installer_type if record is not None else ""
+    return installer_type
@@ -0,0 +1,252 @@
+import itertools
+import queue
+import subprocess
+import sys
+import threading
+
+# Keep console windows from flashing up when the GUI spawns winget
+_CREATIONFLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0) if sys.platform == "win32" else 0
+
+
+class DirectRunner:
+    """Starts every command straight from its argv list, without a shell."""
+
+    mode = "direct"
+
+    def run(self, argv, cancel=None, timeout=None, span=None):
+        """Run argv to completion and return (returncode, output)."""
+        lines = []
+        code = self.stream(argv, lines.append, cancel, timeout, span)
+        return code, "".join(lines)
+
+    def stream(self, argv, on_line, cancel=None, timeout=None, span=None):
+        """Run argv, passing each output line to on_line; return the exit code.
+
+        span (a guilite.trace.ProcessSpan) is told when the process starts and prints.
+        """
+        if span is not None:
+            span.spawning()
+        process = subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=_CREATIONFLAGS
+        )
+        if span is not None:
+            span.spawned()
+        if cancel is not None:
+            cancel.attach(process)
+        timer = _kill_after(timeout, process)
+        try:
+            for line in process.stdout:
+                if span is not None:
+                    span.output(len(line))
+                on_line(line)
+            return process.wait()
+        finally:
+            process.stdout.close()
+            if timer is not None:
+                timer.cancel()
+            if cancel is not None:
+                cancel.detach(process)
+
+    def close(self):
+        pass
+
+
+def _kill_after(timeout, process):
+    if not timeout:
+        return None
+    timer = threading.Timer(timeout, _kill, args=(process,))
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def _kill(process):
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+class AsyncRunner:
+    """Runs commands on the shared asyncio engine (guilite.engine).
+
+    Callers still block until their command finishes, but the processes
+    themselves are started and read by the engine's single loop thread,
+    which also caps how many run at once.
+    """
+
+    mode = "async"
+
+    def __init__(self, engine=None):
+        self._engine = engine
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from .engine import get_engine
+            self._engine = get_engine()
+        return self._engine
+
+    def run(self, argv, cancel=None, timeout=None, span=None):
+        return self.engine.run(argv, None, timeout, cancel, span)
+
+    def stream(self, argv, on_line, cancel=None, timeout=None, span=None):
+        # Lines come back to the calling thread, so a slow on_line never stalls the loop
+        lines = queue.SimpleQueue()
+        future = self.engine.submit(self.engine.exec(argv, lines.put, timeout, cancel, span))
+        future.add_done_callback(lambda f: lines.put(None))
+        while True:
+            line = lines.get()
+            if line is None:
+                break
+            on_line(line)
+        code, _ = future.result()
+        return code
+
+    def close(self):
+        pass
+
+
+def ps_quote(arg):
+    return "'" + str(arg).replace("'", "''") + "'"
+
+
+class ShellWorker:
+    """One long-lived PowerShell that runs commands sent over stdin.
+
+    Each command is followed by a marker line carrying a unique token and the
+    exit code, so output can be framed without restarting the shell.
+    """
+
+    _tokens = itertools.count(1)
+
+    def __init__(self, executable="powershell"):
+        self.executable = executable
+        self.process = None
+
+    def _ensure_started(self):
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [self.executable, "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=_CREATIONFLAGS
+        )
+        self._send("chcp 65001 >$null; [Console]::OutputEncoding = [System.Text.Encoding]::UTF8")
+
+    def _send(self, line):
+        self.process.stdin.write(line + "\n")
+        self.process.stdin.flush()
+
+    def stream(self, command, on_line, cancel=None, timeout=None, span=None):
+        """Run a PowerShell command line (or argv list) and return its exit code."""
+        if not isinstance(command, str):
+            command = "& " + " ".join(ps_quote(arg) for arg in command)
+        if span is not None:
+            span.spawning()
+        self._ensure_started()
+        marker = f"<<<WGL-END-{next(self._tokens)}"
+        process = self.process
+        if cancel is not None:
+            cancel.attach(process)
+        # Timing out costs the whole shell, like cancelling does
+        timer = _kill_after(timeout, process)
+        try:
+            self._send(f"{command} 2>&1 | ForEach-Object {{ \"$_\" }}; \"{marker} $LASTEXITCODE>>>\"")
+            if span is not None:
+                # Includes starting the shell when there was none yet
+                span.spawned()
+            for line in process.stdout:
+                if line.startswith(marker):
+                    code = line[len(marker):].strip().rstrip(">").strip()
+                    try:
+                        return int(code)
+                    except ValueError:
+                        return 0
+                if span is not None:
+                    span.output(len(line))
+                on_line(line)
+            # The shell died (or was killed by cancel); start a new one next time
+            self.process = None
+            return -1
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if cancel is not None:
+                cancel.detach(process)
+
+    def close(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+        self.process = None
+
+
+class ShellRunner:
+    """A small pool of ShellWorkers so parallel callers don't queue on one shell."""
+
+    mode = "shell"
+
+    def __init__(self, size=4, executable="powershell"):
+        self._idle = [ShellWorker(executable) for _ in range(size)]
+        self._cond = threading.Condition()
+
+    def run(self, command, cancel=None, timeout=None, span=None):
+        lines = []
+        code = self.stream(command, lines.append, cancel, timeout, span)
+        return code, "".join(lines)
+
+    def stream(self, command, on_line, cancel=None, timeout=None, span=None):
+        with self._cond:
+            while not self._idle:
+                self._cond.wait()
+            worker = self._idle.pop()
+        try:
+            return worker.stream(command, on_line, cancel, timeout, span)
+        finally:
+            with self._cond:
+                self._idle.append(worker)
+                self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            for worker in self._idle:
+                worker.close()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner(mode=None):
+    """Return the shared runner for mode ("async", "direct" or "shell")."""
+    global _runner
+    from . import settings
+    mode = mode or settings.EXEC_MODE
+    with _runner_lock:
+        if _runner is None or _runner.mode != mode:
+            if _runner is not None:
+                _runner.close()
+            if mode == "shell":
+                _runner = ShellRunner(size=settings.READ_WORKERS + 1)
+            elif mode == "async":
+                _runner = AsyncRunner()
+            else:
+                _runner = DirectRunner()
+        return _runner
@@ -0,0 +1,281 @@
+"""One scheduler for all winget work, shared by every window.
+
+Jobs run in one of two lanes: READ (search, show, list) runs on a small
+pool of threads, WRITE (install, upgrade, uninstall) runs one job at a time
+so two windows never fight over winget's install lock. Within a lane, USER
+jobs go ahead of BACKGROUND ones, and one read thread is always kept free
+of background work so a search never waits behind prefetching.
+
+A job submitted with the key of a job that is still pending or running is
+not queued again: the existing job is returned (and moved up if the new
+submission has a higher priority). Jobs that fail transiently are retried
+with exponential backoff.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+import traceback
+
+from . import settings, trace
+from .cancel import CancelToken
+
+READ = "read"
+WRITE = "write"
+
+USER = 0
+BACKGROUND = 10
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Download failed, another install in progress (winget's and msiexec's)
+TRANSIENT_CODES = {0x8A150008, 0x8A150112, 1618}
+
+
+def is_transient(result):
+    """True for a (returncode, output) result worth trying again."""
+    return isinstance(result, tuple) and bool(result) and result[0] in TRANSIENT_CODES
+
+
+class TransientError(Exception):
+    """Raise from a job that doesn't return (returncode, output) to have it retried."""
+
+
+class Job:
+    """One unit of work. func(cancel_token) runs on a scheduler thread.
+
+    on_done(job) callbacks run on that thread too once the job is finished,
+    failed (job.error holds the exception) or cancelled.
+    """
+
+    def __init__(self, scheduler, func, key, lane, priority, label, retries):
+        self.scheduler = scheduler
+        self.func = func
+        self.key = key
+        self.lane = lane
+        self.priority = priority
+        self.label = label
+        self.retries = retries
+        self.token = CancelToken()
+        self.state = PENDING
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.callbacks = []
+        self._done = threading.Event()
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+    def wait(self, timeout=None):
+        """Block until the job is finished, failed or cancelled; False on timeout."""
+        return self._done.wait(timeout)
+
+    def __repr__(self):
+        return f"<Job {self.label or self.key} {self.lane} {self.state}>"
+
+
+class Scheduler:
+    """Runs Jobs in READ/WRITE lanes; subscribe(callback) to follow its state."""
+
+    def __init__(self, read_workers=4, retries=2, backoff=1.0, transient=is_transient):
+        self.workers = {READ: read_workers, WRITE: 1}
+        self.retries = retries
+        self.backoff = backoff
+        self.transient = transient
+        self._cond = threading.Condition()
+        self._queues = {READ: [], WRITE: []}
+        self._threads = {READ: [], WRITE: []}
+        self._running = {READ: [], WRITE: []}
+        self._by_key = {}
+        self._seq = itertools.count()
+        self._subscribers = []
+
+    def submit(self, func, key=None, lane=READ, priority=USER, label="", on_done=None, retries=None):
+        with self._cond:
+            job = self._by_key.get(key) if key is not None else None
+            if job is not None:
+                if on_done is not None:
+                    job.callbacks.append(on_done)
+                if priority < job.priority and job.state == PENDING:
+                    job.priority = priority
+                    self._push(job)
+                return job
+            job = Job(self, func, key, lane, priority, label, self.retries if retries is None else retries)
+            if on_done is not None:
+                job.callbacks.append(on_done)
+            if key is not None:
+                self._by_key[key] = job
+            self._push(job)
+            self._spawn(lane)
+        self._notify()
+        return job
+
+    def cancel(self, job):
+        with self._cond:
+            if job.state not in (PENDING, RUNNING):
+                return
+            was_pending = job.state == PENDING
+            job.state = CANCELLED
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+        job.token.cancel()
+        if was_pending:
+            # A running job finishes (and reports) on its own thread
+            self._finish(job)
+
+    def subscribe(self, callback):
+        """callback(snapshot) is called from scheduler threads on every change."""
+        with self._cond:
+            self._subscribers.append(callback)
+        callback(self.snapshot())
+
+    def unsubscribe(self, callback):
+        with self._cond:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def snapshot(self):
+        with self._cond:
+            pending = {lane: len({id(job) for _, _, job in queue if job.state == PENDING})
+                       for lane, queue in self._queues.items()}
+            return {
+                "running": [(job.lane, job.label) for lane in (WRITE, READ) for job in self._running[lane]],
+                "pending": pending,
+            }
+
+    def _push(self, job):
+        heapq.heappush(self._queues[job.lane], (job.priority, next(self._seq), job))
+        self._cond.notify_all()
+
+    def _spawn(self, lane):
+        threads = self._threads[lane]
+        if len(threads) < self.workers[lane]:
+            t = threading.Thread(target=self._worker, args=(lane,), name=f"guilite-{lane}-{len(threads)}", daemon=True)
+            threads.append(t)
+            t.start()
+
+    def _next(self, lane):
+        # Called with the lock held: the best runnable job, or None
+        queue = self._queues[lane]
+        while queue:
+            priority, _, job = queue[0]
+            if job.state != PENDING or priority != job.priority:
+                heapq.heappop(queue)    # cancelled, or pushed again with a higher priority
+                continue
+            if priority >= BACKGROUND and self.workers[lane] > 1:
+                background = sum(1 for j in self._running[lane] if j.priority >= BACKGROUND)
+                if background >= self.workers[lane] - 1:
+                    return None
+            return heapq.heappop(queue)[2]
+        return None
+
+    def _worker(self, lane):
+        while True:
+            with self._cond:
+                job = self._next(lane)
+                while job is None:
+                    self._cond.wait()
+                    job = self._next(lane)
+                job.state = RUNNING
+                job.attempts += 1
+                job.started = job.started or time.perf_counter()
+                self._running[lane].append(job)
+            self._notify()
+            self._run(job)
+
+    def _run(self, job):
+        result = error = None
+        trace.bind_job(job)
+        try:
+            result = job.func(job.token)
+        except Exception as e:
+            error = e
+        finally:
+            trace.bind_job(None)
+        with self._cond:
+            self._running[job.lane].remove(job)
+            self._cond.notify_all()
+            retry = (job.state == RUNNING and job.attempts <= job.retries
+                     and (isinstance(error, (OSError, TransientError)) or (error is None and self.transient(result))))
+            if retry:
+                job.state = PENDING
+            elif job.state == RUNNING:
+                job.state = FAILED if error is not None else DONE
+                if self._by_key.get(job.key) is job:
+                    del self._by_key[job.key]
+            job.result, job.error = result, error
+        if retry:
+            delay = self.backoff * 2 ** (job.attempts - 1) * random.uniform(0.8, 1.2)
+            timer = threading.Timer(delay, self._requeue, args=(job,))
+            timer.daemon = True
+            timer.start()
+            self._notify()
+            return
+        self._finish(job)
+
+    def _requeue(self, job):
+        with self._cond:
+            if job.state == PENDING:
+                self._push(job)
+        self._notify()
+
+    def _finish(self, job):
+        job.finished = time.perf_counter()
+        trace.get_tracer().job(job)
+        for callback in job.callbacks:
+            try:
+                callback(job)
+            except Exception:
+                traceback.print_exc()
+        job._done.set()
+        self._notify()
+
+    def _notify(self):
+        with self._cond:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return
+        snapshot = self.snapshot()
+        for callback in subscribers:
+            callback(snapshot)
+
+
+def describe(snapshot):
+    """One status line for a scheduler snapshot, "" when idle."""
+    parts = []
+    writes = [label for lane, label in snapshot["running"] if lane == WRITE]
+    reads = [label for lane, label in snapshot["running"] if lane == READ]
+    if writes:
+        parts.append(writes[0])
+    if reads:
+        parts.append(reads[0] if len(reads) == 1 else f"{len(reads)} queries running")
+    waiting = snapshot["pending"][READ] + snapshot["pending"][WRITE]
+    if waiting:
+        parts.append(f"{waiting} waiting")
+    return " · ".join(parts)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """The scheduler shared by every window."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler(
+                read_workers=settings.READ_WORKERS,
+                retries=settings.RETRIES,
+                backoff=settings.RETRY_BACKOFF
+            )
+        return _scheduler
@@ -0,0 +1,115 @@
+import os
+import sys
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _env_float(name, default):
+    try:
+        return max(0.0, float(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def _default_data_dir():
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "WinGUILite")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "winguilite")
+
+
+# Where caches and other per-user state are kept
+DATA_DIR = os.environ.get("WINGUILITE_DATA_DIR") or _default_data_dir()
+
+# "winget" talks to the real winget; "fake" uses guilite.fake.FakeWinget (benchmarks, non-Windows runs)
+BACKEND = os.environ.get("WINGUILITE_BACKEND", "winget").lower()
+FAKE_LATENCY = _env_float("WINGUILITE_FAKE_LATENCY", 0.3)
+FAKE_ROWS = _env_int("WINGUILITE_FAKE_ROWS", 40)
+FAKE_FAIL_RATE = _env_float("WINGUILITE_FAKE_FAIL_RATE", 0.0)
+FAKE_RECORDINGS = os.environ.get("WINGUILITE_FAKE_RECORDINGS") or None
+
+# "async" runs winget on one asyncio event loop thread (at most MAX_PROCESSES at once);
+# "direct" starts it from the calling thread; "shell" sends commands to long-lived
+# PowerShell workers. Queries (search, show, list) are killed after QUERY_TIMEOUT
+# seconds, installs and upgrades after INSTALL_TIMEOUT (0 waits forever)
+EXEC_MODE = os.environ.get("WINGUILITE_EXEC_MODE", "async").lower()
+MAX_PROCESSES = _env_int("WINGUILITE_MAX_PROCESSES", 8)
+QUERY_TIMEOUT = _env_float("WINGUILITE_QUERY_TIMEOUT", 120)
+INSTALL_TIMEOUT = _env_float("WINGUILITE_INSTALL_TIMEOUT", 3600)
+
+# Scheduler: how many read-only winget calls (search, show, list) may run at the same
+# time; installs, upgrades and uninstalls always run one at a time. Transient failures
+# are retried RETRIES times, waiting RETRY_BACKOFF seconds and doubling
+READ_WORKERS = _env_int("WINGUILITE_READ_WORKERS", _env_int("WINGUILITE_PREFETCH_WORKERS", 6))
+RETRIES = int(_env_float("WINGUILITE_RETRIES", 2))
+RETRY_BACKOFF = _env_float("WINGUILITE_RETRY_BACKOFF", 1.0)
+
+# `winget show` cache: fresh for CACHE_TTL seconds, then served stale (and refreshed
+# in the background) for CACHE_STALE seconds more; at most CACHE_MAX_ENTRIES are kept
+CACHE_PATH = os.path.join(DATA_DIR, "details.sqlite3")
+CACHE_TTL = _env_int("WINGUILITE_CACHE_TTL", 24 * 3600)
+CACHE_STALE = _env_int("WINGUILITE_CACHE_STALE", 7 * 24 * 3600)
+CACHE_MAX_ENTRIES = _env_int("WINGUILITE_CACHE_MAX_ENTRIES", 2000)
+# Parsed `winget show` records kept in memory; the raw text is only kept with KEEP_RAW_DETAILS
+RECORD_MAX_ENTRIES = _env_int("WINGUILITE_RECORD_MAX_ENTRIES", 1000)
+KEEP_RAW_DETAILS = os.environ.get("WINGUILITE_KEEP_RAW_DETAILS", "") not in ("", "0")
+
+# Live install/uninstall output: widget keeps LOG_MAX_LINES lines and redraws LOG_FPS times a second.
+# With WINGUILITE_SAVE_LOGS=1 the full output is also written to LOG_DIR.
+LOG_MAX_LINES = _env_int("WINGUILITE_LOG_MAX_LINES", 2000)
+LOG_FPS = _env_int("WINGUILITE_LOG_FPS", 20)
+SAVE_LOGS = os.environ.get("WINGUILITE_SAVE_LOGS", "") not in ("", "0")
+LOG_DIR = os.path.join(DATA_DIR, "logs")
+
+# packages/*.json merged into one file, rebuilt when a source file changes
+CATALOG_PATH = os.path.join(DATA_DIR, "catalog.json")
+# For benchmarks/bench_startup.py: "main", "installer", "updates" or "search" opens that
+# window, prints the time since launch once it is drawn and exits
+STARTUP_PROBE = os.environ.get("WINGUILITE_STARTUP_PROBE", "").lower() or None
+
+# Timing of every winget process, scheduler job and UI stall (see guilite/trace.py), kept
+# for the last TRACE_MAX_RECORDS of them; the Diagnostics window exports them to TRACE_DIR.
+# A UI-thread heartbeat that arrives more than STALL_THRESHOLD_MS late counts as a stall.
+TRACE = os.environ.get("WINGUILITE_TRACE", "1") not in ("", "0")
+TRACE_MAX_RECORDS = _env_int("WINGUILITE_TRACE_MAX_RECORDS", 5000)
+TRACE_DIR = os.path.join(DATA_DIR, "traces")
+STALL_THRESHOLD_MS = _env_int("WINGUILITE_STALL_THRESHOLD_MS", 50)
+
+# Search-as-you-type: local index lookups run on every key press, a real winget search
+# starts SEARCH_DEBOUNCE_MS after typing stops (for queries of at least SEARCH_MIN_CHARS).
+# WINGUILITE_INDEX_DUMP may point at a JSON list of {Name, Id, Version, Moniker, Tags}.
+# INDEX_PATH keeps the INDEX_MAX_SAVED packages most recently seen in search and show results.
+INDEX_PATH = os.path.join(DATA_DIR, "index.json")
+INDEX_MAX_SAVED = _env_int("WINGUILITE_INDEX_MAX_SAVED", 5000)
+INDEX_DUMP = os.environ.get("WINGUILITE_INDEX_DUMP") or None
+INDEX_RESULTS = _env_int("WINGUILITE_INDEX_RESULTS", 50)
+SEARCH_DEBOUNCE_MS = _env_int("WINGUILITE_SEARCH_DEBOUNCE_MS", 400)
+SEARCH_MIN_CHARS = _env_int("WINGUILITE_SEARCH_MIN_CHARS", 2)
+
+# Installed applications: a `winget list` snapshot saved at INSTALLED_PATH; the Update
+# Manager takes a new one when the saved one is older than INSTALLED_MAX_AGE seconds
+INSTALLED_PATH = os.path.join(DATA_DIR, "installed.json")
+INSTALLED_MAX_AGE = _env_int("WINGUILITE_INSTALLED_MAX_AGE", 15 * 60)
+# Background upgrade polling every POLL_INTERVAL seconds (0 turns it off), backing off
+# up to POLL_MAX_INTERVAL after failures; with POLL_IDLE_ONLY a poll waits until the
+# keyboard and mouse have been idle for POLL_IDLE_SECONDS (Windows only)
+POLL_INTERVAL = int(_env_float("WINGUILITE_POLL_INTERVAL", 3600))
+POLL_MAX_INTERVAL = _env_int("WINGUILITE_POLL_MAX_INTERVAL", 6 * 3600)
+POLL_IDLE_ONLY = os.environ.get("WINGUILITE_POLL_IDLE_ONLY", "1") not in ("", "0")
+POLL_IDLE_SECONDS = _env_int("WINGUILITE_POLL_IDLE_SECONDS", 120)
+
+# Multi Installer: "batch" installs the selection with one `winget import` (failures are
+# retried one by one), "sequential" runs one winget install per package, "pipeline"
+# downloads ahead while installing one package at a time
+INSTALL_MODE = os.environ.get("WINGUILITE_INSTALL_MODE", "batch").lower()
+# Update Manager: "sequential" (one winget upgrade after another) or "pipeline"; the
+# pipeline runs downloaded installers itself, so it stays opt-in for now
+UPDATE_MODE = os.environ.get("WINGUILITE_UPDATE_MODE", "sequential").lower()
+DOWNLOAD_DIR = os.environ.get("WINGUILITE_DOWNLOAD_DIR") or os.path.join(DATA_DIR, "downloads")
+DOWNLOAD_WORKERS = _env_int("WINGUILITE_DOWNLOAD_WORKERS", 3)
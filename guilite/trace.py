@@ -0,0 +1,280 @@
+"""Timing records for every winget process, scheduler job and UI stall.
+
+The backend opens a ProcessSpan per child process and the runner fills it
+in as the process starts, prints and exits:
+
+    queue_wait      scheduler queue + waiting for a process slot
+    start_latency   spawn call until the process exists
+    ttfb            spawn call until the first byte of output
+    duration        spawn call until exit
+
+Records go into a bounded in-memory buffer. export_jsonl() and
+export_chrome() write them out; the latter loads in chrome://tracing or
+Perfetto. summary() gives the percentiles shown by the Diagnostics window.
+"""
+import collections
+import json
+import math
+import os
+import threading
+import time
+
+PROCESS = "process"
+JOB = "job"
+STALL = "stall"
+
+_local = threading.local()
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of values (p in 0-100); None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(p / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def bind_job(job):
+    """Tell spans opened on this thread which scheduler job they belong to.
+
+    The job's time in the scheduler queue is added to the queue wait of the
+    first process it starts only.
+    """
+    _local.job = job
+    _local.job_wait = job.started - job.submitted if job is not None and job.started is not None else 0.0
+
+
+def current_job():
+    return getattr(_local, "job", None)
+
+
+class ProcessSpan:
+    """One child process; the runner calls spawning/spawned/output, the backend end()."""
+
+    __slots__ = ("tracer", "kind", "pkg_id", "thread", "job", "job_wait", "called", "spawn_start", "spawn_end",
+                 "first_output", "ended", "code", "bytes")
+
+    def __init__(self, tracer, kind, pkg_id):
+        self.tracer = tracer
+        self.kind = kind
+        self.pkg_id = pkg_id
+        self.thread = threading.current_thread().name
+        self.job = current_job()
+        self.job_wait = getattr(_local, "job_wait", 0.0)
+        _local.job_wait = 0.0
+        self.called = time.perf_counter()
+        self.spawn_start = self.spawn_end = self.first_output = self.ended = None
+        self.code = None
+        self.bytes = 0
+
+    def spawning(self):
+        self.spawn_start = time.perf_counter()
+
+    def spawned(self):
+        self.spawn_end = time.perf_counter()
+
+    def output(self, nbytes):
+        if self.first_output is None:
+            self.first_output = time.perf_counter()
+        self.bytes += nbytes
+
+    def end(self, code):
+        self.ended = time.perf_counter()
+        self.code = code
+        self.tracer.add(self.record())
+
+    def record(self):
+        start = self.spawn_start or self.called
+
+        def ms(t):
+            return None if t is None else round((t - start) * 1000, 3)
+
+        return {
+            "type": PROCESS,
+            "kind": self.kind,
+            "pkg_id": self.pkg_id,
+            "job": self.job.label if self.job is not None else None,
+            "thread": self.thread,
+            "start": start,
+            "queue_wait_ms": round((self.job_wait + start - self.called) * 1000, 3),
+            "start_latency_ms": ms(self.spawn_end),
+            "ttfb_ms": ms(self.first_output),
+            "duration_ms": ms(self.ended),
+            "exit_code": self.code,
+            "bytes": self.bytes,
+        }
+
+
+class Tracer:
+    """Thread-safe ring buffer of the last max_records records."""
+
+    def __init__(self, enabled=True, max_records=5000):
+        self.enabled = enabled
+        self._records = collections.deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        # perf_counter() values in records are relative to this moment in wall-clock time
+        self.origin = time.perf_counter()
+        self.origin_wall = time.time()
+
+    def process(self, kind, pkg_id=None):
+        """A new ProcessSpan, or None while tracing is off."""
+        return ProcessSpan(self, kind, pkg_id) if self.enabled else None
+
+    def job(self, job):
+        # Called by the scheduler once a job is finished, failed or cancelled
+        if not self.enabled or job.started is None:
+            return
+        self.add({
+            "type": JOB,
+            "label": job.label or repr(job.key),
+            "lane": job.lane,
+            "state": job.state,
+            "attempts": job.attempts,
+            "start": job.started,
+            "queue_wait_ms": round((job.started - job.submitted) * 1000, 3),
+            "duration_ms": round((job.finished - job.started) * 1000, 3),
+        })
+
+    def stall(self, start, ms):
+        if self.enabled:
+            self.add({"type": STALL, "start": start, "duration_ms": round(ms, 3)})
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def records(self, kind=None):
+        with self._lock:
+            records = list(self._records)
+        return [record for record in records if kind is None or record["type"] == kind]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """{"processes": {kind: stats}, "jobs": {lane: stats}, "stalls": stats}.
+
+        Each stats dict has count (and failed for processes) plus
+        {field: {p: value}} for its timing fields.
+        """
+        def stats(records, fields):
+            result = {"count": len(records)}
+            for field in fields:
+                values = [record[field] for record in records if record.get(field) is not None]
+                result[field] = {p: percentile(values, p) for p in percentiles}
+            return result
+
+        processes = collections.defaultdict(list)
+        jobs = collections.defaultdict(list)
+        stalls = []
+        for record in self.records():
+            if record["type"] == PROCESS:
+                processes[record["kind"]].append(record)
+            elif record["type"] == JOB:
+                jobs[record["lane"]].append(record)
+            else:
+                stalls.append(record)
+        summary = {"processes": {}, "jobs": {}, "stalls": stats(stalls, ("duration_ms",))}
+        for kind, records in sorted(processes.items()):
+            summary["processes"][kind] = stats(records, ("queue_wait_ms", "start_latency_ms", "ttfb_ms", "duration_ms"))
+            summary["processes"][kind]["failed"] = sum(1 for record in records if record["exit_code"] != 0)
+            summary["processes"][kind]["bytes"] = sum(record["bytes"] for record in records)
+        for lane, records in sorted(jobs.items()):
+            summary["jobs"][lane] = stats(records, ("queue_wait_ms", "duration_ms"))
+        return summary
+
+    def _wall(self, start):
+        return self.origin_wall + (start - self.origin)
+
+    def export_jsonl(self, path):
+        """One JSON object per line; "start" becomes wall-clock seconds."""
+        _makedirs(path)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records():
+                record = dict(record, start=round(self._wall(record["start"]), 6))
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def export_chrome(self, path):
+        """Chrome trace-event JSON: jobs per lane, processes per calling thread, stalls on "ui"."""
+        tids = {}
+        events = []
+
+        def tid(name):
+            if name not in tids:
+                tids[name] = len(tids) + 1
+                events.append({"ph": "M", "name": "thread_name", "pid": 1, "tid": tids[name], "args": {"name": name}})
+            return tids[name]
+
+        def us(t):
+            return round((t - self.origin) * 1e6, 1)
+
+        for record in self.records():
+            if record["type"] == PROCESS:
+                name = f"{record['kind']} {record['pkg_id']}" if record["pkg_id"] else record["kind"]
+                args = {key: record[key] for key in ("queue_wait_ms", "start_latency_ms", "ttfb_ms",
+                                                     "exit_code", "bytes", "job")}
+                events.append({"ph": "X", "name": name, "cat": PROCESS, "pid": 1, "tid": tid(record["thread"]),
+                               "ts": us(record["start"]), "dur": round((record["duration_ms"] or 0) * 1000, 1),
+                               "args": args})
+            elif record["type"] == JOB:
+                lane = tid(f"{record['lane']} jobs")
+                wait = record["queue_wait_ms"] * 1000
+                events.append({"ph": "X", "name": f"waiting: {record['label']}", "cat": "queue", "pid": 1,
+                               "tid": lane, "ts": us(record["start"]) - wait, "dur": round(wait, 1)})
+                events.append({"ph": "X", "name": record["label"], "cat": JOB, "pid": 1, "tid": lane,
+                               "ts": us(record["start"]), "dur": round(record["duration_ms"] * 1000, 1),
+                               "args": {"state": record["state"], "attempts": record["attempts"]}})
+            else:
+                events.append({"ph": "X", "name": "UI stall", "cat": STALL, "pid": 1, "tid": tid("ui"),
+                               "ts": us(record["start"]), "dur": round(record["duration_ms"] * 1000, 1)})
+        _makedirs(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _makedirs(path):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+
+class StallMonitor:
+    """Heartbeat on the Tk thread: a tick that runs late means the UI was blocked.
+
+    widget.after() is asked for a tick every interval_ms; any tick arriving
+    more than threshold_ms late is recorded as a stall of that length.
+    """
+
+    def __init__(self, widget, tracer, interval_ms=100, threshold_ms=50):
+        self.widget = widget
+        self.tracer = tracer
+        self.interval = interval_ms / 1000.0
+        self.threshold = threshold_ms / 1000.0
+        self._due = None
+
+    def start(self):
+        self._due = time.perf_counter() + self.interval
+        self.widget.after(int(self.interval * 1000), self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        late = now - self._due
+        if late > self.threshold:
+            self.tracer.stall(self._due, late * 1000)
+        self._due = now + self.interval
+        self.widget.after(int(self.interval * 1000), self._tick)
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """The tracer shared by the backend, scheduler and windows."""
+    global _tracer
+    from . import settings
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(enabled=settings.TRACE, max_records=settings.TRACE_MAX_RECORDS)
+        return _tracer
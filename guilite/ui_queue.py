@@ -0,0 +1,72 @@
+import queue
+import threading
+import time
+import traceback
+
+
+class UiQueue:
+    """Runs callbacks posted from worker threads on the Tk main loop.
+
+    This is the only way results get from other threads to Tk. Each drain
+    runs callbacks for at most `budget` seconds so a burst can't freeze the
+    window; one failing callback (e.g. for a window that was closed) is
+    reported and doesn't stop the rest.
+    """
+
+    def __init__(self, root, interval=30, budget=0.02):
+        self.root = root
+        self.interval = interval
+        self.budget = budget
+        self._queue = queue.SimpleQueue()
+        self.root.after(self.interval, self._drain)
+
+    def post(self, func, *args):
+        self._queue.put((func, args))
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        try:
+            while time.perf_counter() < deadline:
+                func, args = self._queue.get_nowait()
+                try:
+                    func(*args)
+                except Exception:
+                    traceback.print_exc()
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(1 if not self._queue.empty() else self.interval, self._drain)
+
+
+class Batcher:
+    """Collects items on a worker thread and posts them to a UiQueue in lists.
+
+    A batch goes out once it holds `size` items or `interval` seconds have
+    passed since the last one; flush() sends whatever is left.
+    """
+
+    def __init__(self, ui_queue, func, *args, size=50, interval=0.05):
+        self.ui_queue = ui_queue
+        self.func = func
+        self.args = args
+        self.size = size
+        self.interval = interval
+        self._items = []
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+
+    def add(self, item):
+        with self._lock:
+            self._items.append(item)
+            if len(self._items) < self.size and time.monotonic() - self._last < self.interval:
+                return
+            items, self._items = self._items, []
+            self._last = time.monotonic()
+        self.ui_queue.post(self.func, *self.args, items)
+
+    def flush(self):
+        with self._lock:
+            items, self._items = self._items, []
+            self._last = time.monotonic()
+        if items:
+            self.ui_queue.post(self.func, *self.args, items)